@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os
+import sys
+from typing import TextIO
+
+from chessbot.analysis import analyze_positions, read_positions
+from chessbot.tournament import BOT_CLASSES, BOT_OPTIONS, BotConfig
+
+
+def count_finished_results(path: str) -> int:
+    """
+    Returns number of complete lines in output file. An incomplete last line,
+    left by an interrupted run, is removed.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, "rb+") as file:
+        data = file.read()
+        complete_size = data.rfind(b"\n") + 1
+        file.truncate(complete_size)
+
+    return data.count(b"\n", 0, complete_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Analyze positions from an EPD or FEN file using multiple "
+        + "processes. Writes one JSON result per line, in input order."
+    )
+    parser.add_argument(
+        "bot",
+        type=BotConfig,
+        help="bot config such as material:3 or material:2:quiescence, bots are "
+        + f"{', '.join(BOT_CLASSES)}, options are {', '.join(BOT_OPTIONS)}",
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", help="EPD or FEN file, - reads stdin"
+    )
+    parser.add_argument("--output", help="JSONL output file, default is stdout")
+    parser.add_argument("--time-limit", type=float, help="seconds per position")
+    parser.add_argument("--node-limit", type=int, help="nodes per position")
+    parser.add_argument("--bitbases", help="directory with bitbases used by the bot")
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="include search statistics, such as time spent in move generation",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--offset", type=int, default=0, help="skip this many positions"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="append to output, skipping positions that already have a result",
+    )
+    args = parser.parse_args()
+
+    if args.bot.bot_class is None:
+        parser.error("random bot can't analyze positions")
+
+    offset = args.offset
+
+    if args.resume:
+        if not args.output:
+            parser.error("--resume needs --output")
+        offset += count_finished_results(args.output)
+
+    input_file: TextIO
+    if args.input == "-":
+        input_file = sys.stdin
+    else:
+        input_file = open(args.input)
+
+    output_file: TextIO
+    if args.output:
+        output_file = open(args.output, "a" if args.resume else "w")
+    else:
+        output_file = sys.stdout
+
+    positions = read_positions(input_file, offset)
+
+    try:
+        for result in analyze_positions(
+            positions,
+            args.bot,
+            args.workers,
+            args.time_limit,
+            args.node_limit,
+            args.bitbases,
+            args.stats,
+        ):
+            # flush every result, so an interrupted run can be resumed
+            output_file.write(json.dumps(result) + "\n")
+            output_file.flush()
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == "__main__":
+    main()
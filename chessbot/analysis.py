@@ -0,0 +1,165 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from chessbot.board import Board
+from chessbot.enums import Color
+from chessbot.players.base import BaseBot
+from chessbot.search_stats import SilentReporter
+from chessbot.tournament import BotConfig
+
+# Positions submitted per worker before waiting for results. This bounds
+# memory use, while keeping all workers busy.
+POSITIONS_PER_WORKER = 4
+
+# bots of a worker process, indexed by Color, created by init_worker()
+worker_bots: Dict[Color, BaseBot] = {}
+
+# whether results of a worker process include all search statistics
+include_stats = False
+
+
+def parse_epd(line: str) -> Tuple[Board, Dict[str, str]]:
+    """
+    Returns board and operations, such as "id" or "bm", from an EPD line.
+    FEN lines are accepted as well.
+    """
+    fields = line.split()
+    if len(fields) < 4:
+        raise ValueError(f"expected at least 4 fields: {line}")
+
+    halfmove_clock = "0"
+    full_move_count = "1"
+    operations_text = " ".join(fields[4:])
+
+    if len(fields) >= 6 and fields[4].isdigit() and fields[5].isdigit():
+        # FEN with move counters
+        halfmove_clock, full_move_count = fields[4:6]
+        operations_text = " ".join(fields[6:])
+
+    operations: Dict[str, str] = {}
+    for operation in operations_text.split(";"):
+        operation = operation.strip()
+        if not operation:
+            continue
+
+        opcode, _, operand = operation.partition(" ")
+        operations[opcode] = operand.strip().strip('"')
+
+    if "hmvc" in operations:
+        halfmove_clock = operations["hmvc"]
+
+    fen = " ".join(fields[:4] + [halfmove_clock, full_move_count])
+    return Board.from_fen(fen), operations
+
+
+def read_positions(lines: Iterable[str], offset: int) -> Iterator[Tuple[int, str]]:
+    """
+    Yields index and line of positions, skipping the first offset positions.
+    Empty lines and lines starting with # are not positions.
+    """
+    index = 0
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        if index >= offset:
+            yield index, line
+        index += 1
+
+
+def init_worker(
+    config: BotConfig,
+    time_limit: Optional[float],
+    node_limit: Optional[int],
+    bitbases: Optional[str],
+    with_stats: bool,
+) -> None:
+    """
+    Creates bots for both colors in a worker process
+    """
+    global include_stats
+    include_stats = with_stats
+
+    for color in [Color.BLACK, Color.WHITE]:
+        bot = config.create(
+            color, time_limit, node_limit, None, bitbases, SilentReporter(), with_stats
+        )
+        assert isinstance(bot, BaseBot)
+        worker_bots[color] = bot
+
+
+def analyze_position(index: int, line: str) -> Dict[str, Any]:
+    """
+    Searches position in a worker process. Returns result that can be written
+    as JSON. Invalid positions get an error instead of a move.
+    """
+    result: Dict[str, Any] = {"index": index}
+
+    try:
+        board, operations = parse_epd(line)
+    except (AssertionError, KeyError, ValueError):
+        result["line"] = line
+        result["error"] = "invalid position"
+        return result
+
+    result["fen"] = board.to_fen()
+    if "id" in operations:
+        result["id"] = operations["id"]
+
+    if not board.has_legal_moves():
+        result["error"] = "no legal moves"
+        return result
+
+    bot = worker_bots[board.turn]
+
+    # Results should not depend on which positions this worker searched before.
+    bot.transposition_table.clear()
+
+    move = bot.search(board)
+    stats = bot.stats
+
+    result["best_move"] = move.to_uci()
+    result["score"] = stats.best_heuristic
+    result["depth"] = stats.finished_depth
+    result["nodes"] = stats.nodes
+    result["seconds"] = round(stats.seconds, 3)
+
+    if include_stats:
+        result["stats"] = stats.to_dict()
+    return result
+
+
+def analyze_positions(
+    positions: Iterable[Tuple[int, str]],
+    config: BotConfig,
+    workers: int,
+    time_limit: Optional[float],
+    node_limit: Optional[int],
+    bitbases: Optional[str],
+    with_stats: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyzes positions in worker processes, yields results in input order.
+    Positions are read from the iterable only as fast as workers process them.
+    With with_stats, results include all search statistics, including time
+    spent in move generation and evaluation.
+    """
+    pending: Deque["Future[Dict[str, Any]]"] = deque()
+    max_pending = POSITIONS_PER_WORKER * workers
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(config, time_limit, node_limit, bitbases, with_stats),
+    ) as executor:
+        for index, line in positions:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+            pending.append(executor.submit(analyze_position, index, line))
+
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,390 @@
+import mmap
+import os
+from array import array
+from typing import Dict, List, Optional, Tuple, Union
+
+from chessbot.board import Board
+from chessbot.constants import OPPONENT
+from chessbot.enums import Color, PieceType
+
+# Material signatures with a bitbase, in order of generation: a signature can
+# only be generated once the signatures that it can promote into exist.
+BITBASE_SIGNATURES = ["KQK", "KRK", "KPK"]
+
+# Non-king piece of each signature, for the side that has it
+BITBASE_PIECE_TYPES = {
+    PieceType.WHITE_QUEEN: ("KQK", Color.WHITE),
+    PieceType.BLACK_QUEEN: ("KQK", Color.BLACK),
+    PieceType.WHITE_ROOK: ("KRK", Color.WHITE),
+    PieceType.BLACK_ROOK: ("KRK", Color.BLACK),
+    PieceType.WHITE_PAWN: ("KPK", Color.WHITE),
+    PieceType.BLACK_PAWN: ("KPK", Color.BLACK),
+}
+
+SIGNATURE_PIECE_TYPES = {
+    "KQK": PieceType.WHITE_QUEEN,
+    "KRK": PieceType.WHITE_ROOK,
+    "KPK": PieceType.WHITE_PAWN,
+}
+
+# Pieces that can't checkmate a lone king on their own
+MINOR_PIECE_TYPES = [
+    PieceType.WHITE_KNIGHT,
+    PieceType.BLACK_KNIGHT,
+    PieceType.WHITE_BISHOP,
+    PieceType.BLACK_BISHOP,
+]
+
+# One bit per position, set if the side with the extra piece wins.
+# The lone king can never win, so this is enough to tell win, draw and loss.
+#
+# Positions are stored as if the extra piece is white. Layout of bit index:
+# - bits 0-5: square of the extra piece
+# - bits 6-11: square of the black king
+# - bits 12-17: square of the white king
+# - bit 18: set if white is to move
+BITBASE_POSITIONS = 1 << 19
+BITBASE_SIZE_BYTES = BITBASE_POSITIONS // 8
+
+BITBASE_FILE_EXTENSION = ".bitbase"
+
+# Probe results, from the perspective of the player to move
+BITBASE_WIN = 1
+BITBASE_DRAW = 0
+BITBASE_LOSS = -1
+
+# mmap objects and bytes can both be probed
+BitbaseData = Union[bytes, bytearray, mmap.mmap]
+
+
+def get_bitbase_path(directory: str, signature: str) -> str:
+    return os.path.join(directory, signature + BITBASE_FILE_EXTENSION)
+
+
+def get_bitbase_index(white_to_move: bool, squares: Tuple[int, int, int]) -> int:
+    """
+    Returns bit index for squares of white king, black king and extra piece
+    """
+    white_king, black_king, piece = squares
+    return (int(white_to_move) << 18) | (white_king << 12) | (black_king << 6) | piece
+
+
+class Bitbases:
+    def __init__(self, tables: Dict[str, BitbaseData]) -> None:
+        """
+        Looks up positions in bitbases, indexed by material signature
+        """
+        self.tables = tables
+        self.files: List[Tuple[int, mmap.mmap]] = []
+
+    @staticmethod
+    def open(directory: str) -> "Bitbases":
+        """
+        Maps all bitbase files found in directory into memory
+        """
+        bitbases = Bitbases({})
+
+        for signature in BITBASE_SIGNATURES:
+            path = get_bitbase_path(directory, signature)
+            if not os.path.exists(path):
+                continue
+
+            if os.path.getsize(path) != BITBASE_SIZE_BYTES:
+                raise ValueError(f"bitbase {path} has wrong size")
+
+            fd = os.open(path, os.O_RDONLY)
+            data = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            bitbases.files.append((fd, data))
+            bitbases.tables[signature] = data
+
+        return bitbases
+
+    def close(self) -> None:
+        for fd, data in self.files:
+            data.close()
+            os.close(fd)
+
+        self.files = []
+        self.tables = {}
+
+    def get_signature(self, board: Board) -> Optional[Tuple[str, Color, int]]:
+        """
+        Returns signature, side with the extra piece and bit index of board.
+        Returns None if there is no bitbase for the material on board.
+        """
+        occupied = board.occupied[Color.BLACK] | board.occupied[Color.WHITE]
+
+        if occupied.bit_count() != 3:
+            return None
+
+        black_king, white_king = board.king_squares
+        if black_king == -1 or white_king == -1:
+            return None
+
+        piece_bitboard = occupied & ~((1 << black_king) | (1 << white_king))
+        piece = piece_bitboard.bit_length() - 1
+        piece_type = board.mailbox[piece]
+
+        if piece_type not in BITBASE_PIECE_TYPES:
+            return None
+
+        signature, strong = BITBASE_PIECE_TYPES[piece_type]
+
+        if signature not in self.tables:
+            return None
+
+        if strong == Color.WHITE:
+            squares = (white_king, black_king, piece)
+        else:
+            # mirror board vertically and swap colors
+            squares = (black_king ^ 56, white_king ^ 56, piece ^ 56)
+
+        index = get_bitbase_index(board.turn == strong, squares)
+        return signature, strong, index
+
+    def probe(self, board: Board) -> Optional[int]:
+        """
+        Returns BITBASE_WIN, BITBASE_DRAW or BITBASE_LOSS for the player to move
+        with perfect play, None if there is no bitbase for the material on board.
+        En passent and castling rights are ignored.
+        """
+        found = self.get_signature(board)
+        if found is None:
+            return None
+
+        signature, strong, index = found
+        data = self.tables[signature]
+
+        if not (data[index >> 3] >> (index & 7)) & 1:
+            return BITBASE_DRAW
+
+        if board.turn == strong:
+            return BITBASE_WIN
+        return BITBASE_LOSS
+
+
+def is_drawn_material(board: Board) -> bool:
+    """
+    Returns whether only kings and at most one knight or bishop are left
+    """
+    occupied = board.occupied[Color.BLACK] | board.occupied[Color.WHITE]
+    piece_count = occupied.bit_count()
+
+    if piece_count == 2:
+        return True
+
+    if piece_count == 3:
+        minor_pieces = 0
+        for piece_type in MINOR_PIECE_TYPES:
+            minor_pieces |= board.bitboards[piece_type]
+        return minor_pieces != 0
+
+    return False
+
+
+def get_child_result(board: Board, bitbases: Bitbases) -> bool:
+    """
+    Returns whether white wins on board, which has different material than the
+    bitbase being generated
+    """
+    if is_drawn_material(board):
+        return False
+
+    result = bitbases.probe(board)
+    if result is None:
+        raise ValueError(f"missing bitbase for {board.to_fen()}")
+
+    if board.turn == Color.WHITE:
+        return result == BITBASE_WIN
+    return result == BITBASE_LOSS
+
+
+def generate_bitbase(signature: str, bitbases: Bitbases) -> bytearray:
+    """
+    Computes bitbase for signature with retrograde analysis. Positions that the
+    side with the extra piece can promote into are looked up in bitbases.
+    """
+    piece_type = SIGNATURE_PIECE_TYPES[signature]
+    pawn = piece_type == PieceType.WHITE_PAWN
+
+    won = bytearray(BITBASE_POSITIONS)
+
+    # Remaining moves of black positions that don't lose yet. When this drops to
+    # zero, black loses.
+    remaining = array("i", bytes(4 * BITBASE_POSITIONS))
+
+    # positions that are won for white, from which we work backwards
+    queue: List[int] = []
+
+    # edges from position to child with same material
+    edge_parents = array("i")
+    edge_children = array("i")
+
+    for index in range(BITBASE_POSITIONS):
+        white_to_move = bool(index >> 18)
+        white_king = (index >> 12) & 63
+        black_king = (index >> 6) & 63
+        piece = index & 63
+
+        if len({white_king, black_king, piece}) != 3:
+            continue
+
+        if pawn and piece // 8 in [0, 7]:
+            continue
+
+        fields = 64 * [PieceType.EMPTY]
+        fields[white_king] = PieceType.WHITE_KING
+        fields[black_king] = PieceType.BLACK_KING
+        fields[piece] = piece_type
+
+        turn = Color.WHITE if white_to_move else Color.BLACK
+        board = Board(turn, fields)
+
+        # the player that just moved can't be in check
+        if board.is_checked(OPPONENT[turn]):
+            continue
+
+        moves = board.get_legal_moves()
+
+        if not moves:
+            if not white_to_move and board.is_checked(turn):
+                won[index] = 1
+                queue.append(index)
+            continue
+
+        for move in moves:
+            from_ = move.from_
+            to = move.to
+
+            if to in [white_king, black_king, piece] or move.promotion:
+                # material changes, so the result comes from another bitbase
+                board.make_move(move)
+                child_won = get_child_result(board, bitbases)
+                board.unmake_move()
+
+                if white_to_move and child_won and not won[index]:
+                    won[index] = 1
+                    queue.append(index)
+
+                elif not white_to_move and not child_won:
+                    # this move never loses, so black never runs out of moves
+                    remaining[index] += 1
+                continue
+
+            squares = [white_king, black_king, piece]
+            squares[squares.index(from_)] = to
+            child = get_bitbase_index(
+                not white_to_move, (squares[0], squares[1], squares[2])
+            )
+
+            edge_parents.append(index)
+            edge_children.append(child)
+
+            if not white_to_move:
+                remaining[index] += 1
+
+        if not white_to_move and remaining[index] == 0 and not won[index]:
+            # all moves of black change material and lose
+            won[index] = 1
+            queue.append(index)
+
+    parent_offsets, parents = _get_parents(edge_parents, edge_children)
+    del edge_parents, edge_children
+
+    while queue:
+        child = queue.pop()
+
+        for edge in range(parent_offsets[child], parent_offsets[child + 1]):
+            parent = parents[edge]
+
+            if won[parent]:
+                continue
+
+            if parent >> 18:
+                # white to move picks the winning move
+                won[parent] = 1
+                queue.append(parent)
+                continue
+
+            remaining[parent] -= 1
+            if remaining[parent] == 0:
+                # all moves of black lose
+                won[parent] = 1
+                queue.append(parent)
+
+    return _pack_bits(won)
+
+
+def _get_parents(
+    edge_parents: "array[int]", edge_children: "array[int]"
+) -> Tuple["array[int]", "array[int]"]:
+    """
+    Returns parents of each position, using offsets per child into one array
+    """
+    offsets = array("i", bytes(4 * (BITBASE_POSITIONS + 1)))
+
+    for child in edge_children:
+        offsets[child + 1] += 1
+
+    for index in range(BITBASE_POSITIONS):
+        offsets[index + 1] += offsets[index]
+
+    parents = array("i", bytes(4 * len(edge_parents)))
+    next_free = offsets[:-1]
+
+    for parent, child in zip(edge_parents, edge_children):
+        parents[next_free[child]] = parent
+        next_free[child] += 1
+
+    return offsets, parents
+
+
+def _pack_bits(values: bytearray) -> bytearray:
+    packed = bytearray(len(values) // 8)
+
+    for index in range(len(packed)):
+        byte = 0
+        for bit in range(8):
+            byte |= values[8 * index + bit] << bit
+        packed[index] = byte
+
+    return packed
+
+
+def get_win_progress(board: Board) -> int:
+    """
+    Returns how close the side with the extra piece is to winning a bitbase
+    position, used to prefer faster wins. More material is closer to mate,
+    then pushing the pawn or pushing the lone king to the edge with our king
+    nearby.
+    """
+    occupied = board.occupied[Color.BLACK] | board.occupied[Color.WHITE]
+    kings = (
+        board.bitboards[PieceType.BLACK_KING] | board.bitboards[PieceType.WHITE_KING]
+    )
+    piece = (occupied & ~kings).bit_length() - 1
+    piece_type = board.mailbox[piece]
+
+    strong = board.get_piece_color(piece)
+    strong_king = board.king_squares[strong]
+    weak_king = board.king_squares[OPPONENT[strong]]
+
+    if piece_type in [PieceType.WHITE_PAWN, PieceType.BLACK_PAWN]:
+        if strong == Color.WHITE:
+            rows_moved = 6 - piece // 8
+        else:
+            rows_moved = piece // 8 - 1
+        return 100 + 10 * rows_moved
+
+    # distance of lone king to the center, from 0 to 6
+    x = weak_king % 8
+    y = weak_king // 8
+    center_distance = max(3 - x, x - 4) + max(3 - y, y - 4)
+
+    king_distance = max(abs(x - strong_king % 8), abs(y - strong_king // 8))
+
+    progress = 20 * center_distance + 10 * (7 - king_distance)
+
+    if piece_type in [PieceType.WHITE_QUEEN, PieceType.BLACK_QUEEN]:
+        return 900 + progress
+    return 500 + progress
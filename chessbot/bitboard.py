@@ -0,0 +1,26 @@
+from typing import Iterator
+
+from chessbot.constants import (
+    BISHOP_ATTACK_MASKS,
+    BISHOP_ATTACK_TABLES,
+    ROOK_ATTACK_MASKS,
+    ROOK_ATTACK_TABLES,
+)
+
+
+def iter_squares(bitboard: int) -> Iterator[int]:
+    """
+    Yields squares of all set bits, lowest square first
+    """
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        yield lowest_bit.bit_length() - 1
+        bitboard ^= lowest_bit
+
+
+def get_rook_attacks(square: int, occupied: int) -> int:
+    return ROOK_ATTACK_TABLES[square][occupied & ROOK_ATTACK_MASKS[square]]
+
+
+def get_bishop_attacks(square: int, occupied: int) -> int:
+    return BISHOP_ATTACK_TABLES[square][occupied & BISHOP_ATTACK_MASKS[square]]
@@ -1,48 +1,99 @@
-from typing import Any, Dict, Final, Iterable, List, Optional, Tuple
+import mmap
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
+from chessbot.bitboard import get_bishop_attacks, get_rook_attacks, iter_squares
 from chessbot.board_printer import print_board
 from chessbot.constants import (
-    BISHOP_DIRECTIONS,
+    BETWEEN_BITBOARDS,
+    BISHOP_LINES,
+    BISHOP_PIECE_TYPES,
     BOARD_START_FIELDS,
+    CASTLING_EMPTY_BITBOARDS,
+    CASTLING_SQUARES,
     CASTLING_TO_FEN_CHAR,
+    COLOR_PIECE_TYPES,
+    COLUMN_BITBOARDS,
+    DOUBLE_PUSH_ROW_BITBOARDS,
     EN_PASSENT_CAPTURER_Y,
     FEN_CHAR_TO_CASTLING,
     FEN_CHAR_TO_PIECE_TYPE,
-    KING_DELTAS,
-    KNIGHT_DELTAS,
+    FULL_BITBOARD,
+    KING_ATTACKS,
+    KING_PIECE_TYPES,
+    KNIGHT_ATTACKS,
+    KNIGHT_PIECE_TYPES,
+    OPPONENT,
+    PAWN_ATTACKS,
     PAWN_DELTA_Y,
-    PAWN_START_Y,
+    PAWN_PIECE_TYPES,
     PIECE_TYPE_TO_FEN_CHAR,
-    PRE_PROMOTION_Y,
     PROMOTION_PIECE_TYPES,
-    QUEEN_DIRECTIONS,
-    ROOK_DIRECTIONS,
+    PROMOTION_ROW_BITBOARDS,
+    QUEEN_PIECE_TYPES,
+    ROOK_LINES,
+    ROOK_PIECE_TYPES,
+    SQUARE_DISALLOWED_CASTLING,
 )
-from chessbot.enums import (
-    SQUARE_A1,
-    SQUARE_A8,
-    SQUARE_B1,
-    SQUARE_B8,
-    SQUARE_C1,
-    SQUARE_C8,
-    SQUARE_D1,
-    SQUARE_D8,
-    SQUARE_E1,
-    SQUARE_E8,
-    SQUARE_F1,
-    SQUARE_F8,
-    SQUARE_G1,
-    SQUARE_G8,
-    SQUARE_H1,
-    SQUARE_H8,
-    Castling,
-    Color,
-    PieceType,
+from chessbot.enums import Castling, Color, MoveFlag, PieceType
+from chessbot.evaluation import PieceSquareTable
+from chessbot.move import (
+    MOVE_FLAG_SHIFT,
+    MOVE_PROMOTION_SHIFT,
+    MOVE_TO_SHIFT,
+    NORMAL_MOVES,
+    NULL_MOVE,
+    Move,
 )
+from chessbot.zobrist import (
+    ZOBRIST_BLACK_TO_MOVE,
+    ZOBRIST_CASTLING,
+    ZOBRIST_EN_PASSENT,
+    ZOBRIST_PIECES,
+)
+
+WHITE_CASTLING = (Castling.WHITE_SHORT, Castling.WHITE_LONG)
+BLACK_CASTLING = (Castling.BLACK_SHORT, Castling.BLACK_LONG)
+
+# rook from and to squares for castling, by square the king moves to
+CASTLING_ROOK_SQUARES = {
+    king_to: (rook_from, rook_to) for _, king_to, rook_from, rook_to in CASTLING_SQUARES
+}
+
+# state needed to revert a move done with Board.make_move()
+HistoryItem = Tuple[
+    Move, PieceType, PieceType, Tuple[bool, ...], Optional[int], int, int, int
+]
+
+# Packed board format, see Board.to_bytes()
+PACKED_BOARD = struct.Struct("<Q16sBBH4x")
+
+# PieceType by value, faster than calling PieceType()
+PIECE_TYPES = list(PieceType)
+
+# Buffers that packed boards can be read from
+PackedBoardData = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# squares on which moving or capturing a piece may remove castling rights
+CASTLING_RIGHTS_BITBOARD = sum(1 << square for square in SQUARE_DISALLOWED_CASTLING)
 
 
 class Board:
-    __slots__ = ("fields", "turn", "en_passent_column", "castling")
+    __slots__ = (
+        "bitboards",
+        "occupied",
+        "turn",
+        "en_passent_column",
+        "castling",
+        "halfmove_clock",
+        "history",
+        "key",
+        "piece_square_table",
+        "score",
+        "mailbox",
+        "king_squares",
+        "_legal_moves",
+    )
 
     def __init__(
         self,
@@ -50,22 +101,151 @@ class Board:
         fields: Iterable[PieceType],
         en_passent_column: Optional[int] = None,
         castling: Optional[Iterable[bool]] = None,
+        halfmove_clock: int = 0,
     ) -> None:
         if castling:
             castling_tuple = tuple(castling)
         else:
             castling_tuple = 4 * (False,)
 
-        self.fields: Final[Tuple[PieceType, ...]] = tuple(fields)
-        self.turn: Final[Color] = turn
+        fields_tuple = tuple(fields)
+        assert len(fields_tuple) == 64
+
+        # one bitboard per PieceType, the one for EMPTY is unused and always 0
+        bitboards = 13 * [0]
+        for square, piece_type in enumerate(fields_tuple):
+            if piece_type != PieceType.EMPTY:
+                bitboards[piece_type] |= 1 << square
+
+        # occupied squares per Color
+        occupied = [0, 0]
+        for color in [Color.BLACK, Color.WHITE]:
+            for piece_type in COLOR_PIECE_TYPES[color]:
+                occupied[color] |= bitboards[piece_type]
+
+        self.bitboards: List[int] = bitboards
+        self.occupied: List[int] = occupied
+        self.turn: Color = turn
         self.en_passent_column: Optional[int] = en_passent_column
-        self.castling: Final[Tuple[bool, ...]] = castling_tuple
+        self.castling: Tuple[bool, ...] = castling_tuple
+
+        # plies since the last capture or pawn move, for the fifty-move rule
+        self.halfmove_clock = halfmove_clock
+
+        # PieceType per square and square of each king, -1 if there is none
+        self.mailbox: List[PieceType] = list(fields_tuple)
+        self.king_squares: List[int] = self.compute_king_squares()
+
+        # cache for get_legal_moves(), cleared by make_move() and unmake_move()
+        self._legal_moves: Optional[List[Move]] = None
+
+        # state needed to revert moves done with make_move()
+        self.history: List[HistoryItem] = []
+
+        # Zobrist hash, updated by make_move() and unmake_move()
+        self.key = self.compute_key()
+
+        # score from piece_square_table, updated by make_move() and unmake_move()
+        self.piece_square_table: Optional[PieceSquareTable] = None
+        self.score = 0
+
         self.validate()
 
     def validate(self) -> None:
         assert self.turn != Color.NOBODY
-        assert len(self.fields) == 64
+        assert len(self.bitboards) == 13
+        assert self.bitboards[PieceType.EMPTY] == 0
+        assert self.occupied[Color.BLACK] & self.occupied[Color.WHITE] == 0
         assert len(self.castling) == 4
+        assert self.halfmove_clock >= 0
+        assert self.key == self.compute_key()
+        assert self.score == self.compute_score()
+        assert self.mailbox == self.compute_mailbox()
+        assert self.king_squares == self.compute_king_squares()
+
+    def compute_king_squares(self) -> List[int]:
+        return [
+            self.bitboards[KING_PIECE_TYPES[color]].bit_length() - 1
+            for color in [Color.BLACK, Color.WHITE]
+        ]
+
+    def compute_mailbox(self) -> List[PieceType]:
+        """
+        Computes PieceType per square from bitboards
+        """
+        mailbox = 64 * [PieceType.EMPTY]
+
+        for color_piece_types in COLOR_PIECE_TYPES:
+            for piece_type in color_piece_types:
+                for square in iter_squares(self.bitboards[piece_type]):
+                    mailbox[square] = piece_type
+
+        return mailbox
+
+    def compute_key(self) -> int:
+        """
+        Computes Zobrist hash of this board from scratch
+        """
+        key = 0
+
+        for color_piece_types in COLOR_PIECE_TYPES:
+            for piece_type in color_piece_types:
+                for square in iter_squares(self.bitboards[piece_type]):
+                    key ^= ZOBRIST_PIECES[piece_type][square]
+
+        if self.turn == Color.BLACK:
+            key ^= ZOBRIST_BLACK_TO_MOVE
+
+        for castling in Castling:
+            if self.castling[castling]:
+                key ^= ZOBRIST_CASTLING[castling]
+
+        if self.en_passent_column is not None and self.can_capture_en_passent():
+            key ^= ZOBRIST_EN_PASSENT[self.en_passent_column]
+
+        return key
+
+    def can_capture_en_passent(self) -> bool:
+        """
+        Returns whether a pawn of the player to move attacks the en passent
+        square, even if capturing would be illegal. Only then the en passent
+        column is part of the Zobrist hash, so positions that only differ in an
+        en passent capture that no pawn can make are the same.
+        """
+        if self.en_passent_column is None:
+            return False
+
+        turn = self.turn
+        to = (
+            8 * (EN_PASSENT_CAPTURER_Y[turn] + PAWN_DELTA_Y[turn])
+        ) + self.en_passent_column
+
+        pawns = self.bitboards[PAWN_PIECE_TYPES[turn]]
+        return bool(PAWN_ATTACKS[OPPONENT[turn]][to] & pawns)
+
+    def compute_score(self) -> int:
+        """
+        Computes sum of piece_square_table values of all pieces from scratch
+        """
+        if self.piece_square_table is None:
+            return 0
+
+        score = 0
+
+        for color_piece_types in COLOR_PIECE_TYPES:
+            for piece_type in color_piece_types:
+                values = self.piece_square_table[piece_type]
+                for square in iter_squares(self.bitboards[piece_type]):
+                    score += values[square]
+
+        return score
+
+    def set_piece_square_table(self, table: Optional[PieceSquareTable]) -> None:
+        """
+        Sets table used for score. Passing None stops updating score.
+        """
+        self.piece_square_table = table
+        self.score = self.compute_score()
 
     @staticmethod
     def empty() -> "Board":
@@ -76,18 +256,18 @@ class Board:
     def start() -> "Board":
         return Board(turn=Color.WHITE, fields=BOARD_START_FIELDS, castling=4 * [True])
 
+    @property
+    def fields(self) -> Tuple[PieceType, ...]:
+        """
+        Returns PieceType for every square
+        """
+        return tuple(self.mailbox)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Board):
             return False
 
-        return all(
-            [
-                self.turn == other.turn,
-                self.fields == other.fields,
-                self.en_passent_column == other.en_passent_column,
-                self.castling == other.castling,
-            ]
-        )
+        return self.key == other.key
 
     @staticmethod
     def from_fen(fen: str) -> "Board":
@@ -138,7 +318,6 @@ class Board:
             en_passent_column = ord(fen_en_passent[0]) - ord("a")
 
         # TODO use
-        _ = pawn_clock
         _ = full_move_count
 
         return Board(
@@ -146,6 +325,7 @@ class Board:
             fields=fields,
             en_passent_column=en_passent_column,
             castling=castling,
+            halfmove_clock=int(pawn_clock),
         )
 
     def to_fen(self) -> str:
@@ -153,7 +333,7 @@ class Board:
         for y in range(8):
             empty_counter = 0
             for x in range(8):
-                piece_type = self.fields[8 * y + x]
+                piece_type = self.mailbox[8 * y + x]
 
                 if piece_type == PieceType.EMPTY:
                     empty_counter += 1
@@ -179,6 +359,9 @@ class Board:
             if self.castling[c]:
                 fen_castling += CASTLING_TO_FEN_CHAR[c]
 
+        if not fen_castling:
+            fen_castling = "-"
+
         if self.en_passent_column is None:
             fen_en_passent = "-"
         else:
@@ -188,8 +371,9 @@ class Board:
             else:
                 fen_en_passent += "3"
 
+        pawn_clock = str(self.halfmove_clock)
+
         # TODO set when created
-        pawn_clock = "0"
         full_move_count = "0"
 
         return " ".join(
@@ -203,668 +387,865 @@ class Board:
             ]
         )
 
-    def editor_link(self) -> str:
-        fen = self.to_fen()
-        return "https://lichess.org/editor/" + "_".join(fen.split(" ")) + "?color=white"
-
-    def __hash__(self) -> int:
-        return hash(self.to_fen())
-
-    def move_piece(
-        self,
-        from_: int,
-        to: int,
-        en_passent_column: Optional[int] = None,
-        disallow_castling: Optional[List[Castling]] = None,
-    ) -> "Board":
-        # we can't only move our own pieces
-        assert self.get_piece_color(from_) == self.turn
-
-        # we can't capture our own pieces
-        assert self.get_piece_color(to) != self.turn
+    def to_bytes(self) -> bytes:
+        """
+        Returns board packed in PACKED_BOARD.size (32) bytes, without history:
+        - bitboard of occupied squares
+        - PieceType per occupied square, 4 bits each, lowest square first
+        - turn and castling: bit 0 is set if white is to move, bits 1-4 are
+          castling rights
+        - en passent column + 1, or 0 if there is none
+        - halfmove clock
+        - 4 unused bytes
+        """
+        occupied = self.occupied[Color.BLACK] | self.occupied[Color.WHITE]
 
-        # NOTE: copying into a list allows modification
-        # self.fields won't (and can't) be changed
-        fields = list(self.fields)
+        piece_types = 0
+        for index, square in enumerate(iter_squares(occupied)):
+            if index == 32:
+                raise ValueError("board with more than 32 pieces can't be packed")
+            piece_types |= self.mailbox[square] << (4 * index)
 
-        castling = list(self.castling)
-        if disallow_castling is not None:
-            for disallow_castling_item in disallow_castling:
-                castling[disallow_castling_item] = False
+        flags = int(self.turn == Color.WHITE)
+        for castling in Castling:
+            if self.castling[castling]:
+                flags |= 2 << castling
 
-        fields[to] = fields[from_]
-        fields[from_] = PieceType.EMPTY
-        return Board(
-            turn=self.turn.opponent(),
-            fields=fields,
-            en_passent_column=en_passent_column,
-            castling=castling,
+        if self.en_passent_column is None:
+            en_passent = 0
+        else:
+            en_passent = self.en_passent_column + 1
+
+        return PACKED_BOARD.pack(
+            occupied,
+            piece_types.to_bytes(16, "little"),
+            flags,
+            en_passent,
+            self.halfmove_clock,
         )
 
-    def promote(self, from_: int, to: int, piece_type: PieceType) -> "Board":
-        fields = list(self.fields)
-        fields[from_] = PieceType.EMPTY
-        fields[to] = piece_type
-        return Board(turn=self.turn.opponent(), fields=fields)
-
-    def get_piece_color(self, square: int) -> Color:
-        return self.fields[square].get_color()
-
-    def show(self, *args: Any, **kwargs: Any) -> None:
-        print_board(self, *args, **kwargs)
+    @staticmethod
+    def from_bytes(data: PackedBoardData, offset: int = 0) -> "Board":
+        """
+        Returns board packed by to_bytes() found at offset in data. Data is
+        read in place, so it can be a memoryview or mmap of a large file.
+        """
+        occupied, packed_piece_types, flags, en_passent, halfmove_clock = (
+            PACKED_BOARD.unpack_from(data, offset)
+        )
 
-    def find_pieces(self, piece_type: PieceType) -> List[int]:
-        squares: List[int] = []
-        for square in range(0, 64):
-            if self.fields[square] == piece_type:
-                squares.append(square)
-        return squares
+        piece_types = int.from_bytes(packed_piece_types, "little")
 
-    def get_knight_moves(self, square: int) -> List["Board"]:
-        x = square % 8
-        y = square // 8
+        board = Board.__new__(Board)
+        board.bitboards = 13 * [0]
+        board.mailbox = 64 * [PieceType.EMPTY]
+        key = 0
 
-        children: List["Board"] = []
+        # fill bitboards, mailbox and key at once, this is faster than
+        # computing them one by one
+        for square in iter_squares(occupied):
+            piece_type = PIECE_TYPES[piece_types & 15]
+            piece_types >>= 4
 
-        for dx, dy in KNIGHT_DELTAS:
-            move_x = x + dx
-            move_y = y + dy
+            board.bitboards[piece_type] |= 1 << square
+            board.mailbox[square] = piece_type
+            key ^= ZOBRIST_PIECES[piece_type][square]
 
-            if move_y not in range(8) or move_x not in range(8):
-                # we're walking off the board
-                continue
+        board.occupied = [
+            sum(board.bitboards[piece_type] for piece_type in COLOR_PIECE_TYPES[color])
+            for color in [Color.BLACK, Color.WHITE]
+        ]
 
-            move_square = (8 * move_y) + move_x
+        if flags & 1:
+            board.turn = Color.WHITE
+        else:
+            board.turn = Color.BLACK
+            key ^= ZOBRIST_BLACK_TO_MOVE
 
-            if self.get_piece_color(move_square) == self.turn:
-                # we're about to capture our own piece
-                continue
+        board.castling = tuple(bool(flags & (2 << castling)) for castling in Castling)
+        for castling in Castling:
+            if board.castling[castling]:
+                key ^= ZOBRIST_CASTLING[castling]
 
-            children.append(self.move_piece(square, move_square))
+        if en_passent == 0:
+            board.en_passent_column = None
+        else:
+            board.en_passent_column = en_passent - 1
+            if board.can_capture_en_passent():
+                key ^= ZOBRIST_EN_PASSENT[board.en_passent_column]
+
+        board.halfmove_clock = halfmove_clock
+        board.history = []
+        board.key = key
+        board.king_squares = board.compute_king_squares()
+        board._legal_moves = None
+        board.piece_square_table = None
+        board.score = 0
+        return board
 
-        return children
+    def editor_link(self) -> str:
+        fen = self.to_fen()
+        return "https://lichess.org/editor/" + "_".join(fen.split(" ")) + "?color=white"
 
-    def get_king_moves(self, square: int) -> List["Board"]:
-        x = square % 8
-        y = square // 8
+    def __hash__(self) -> int:
+        return self.key
 
-        children: List["Board"] = []
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Only pickle what is needed to rebuild the position. This keeps boards
+        # small when they are sent to other processes.
+        return (
+            _board_from_bitboards,
+            (
+                tuple(self.bitboards),
+                int(self.turn),
+                self.en_passent_column,
+                self.castling,
+                self.halfmove_clock,
+            ),
+        )
 
-        for dx, dy in KING_DELTAS:
-            move_x = x + dx
-            move_y = y + dy
+    def copy(self) -> "Board":
+        """
+        Returns copy of this board, without the history of made moves
+        """
+        board = Board.__new__(Board)
+        board.bitboards = self.bitboards.copy()
+        board.occupied = self.occupied.copy()
+        board.turn = self.turn
+        board.en_passent_column = self.en_passent_column
+        board.castling = self.castling
+        board.halfmove_clock = self.halfmove_clock
+        board.history = []
+        board.key = self.key
+        board.piece_square_table = self.piece_square_table
+        board.score = self.score
+        board.mailbox = self.mailbox.copy()
+        board.king_squares = self.king_squares.copy()
+
+        # the cached list is never changed, only replaced
+        board._legal_moves = self._legal_moves
+        return board
+
+    def _update_castling(self, from_: int, to: int) -> None:
+        # moving a king or rook, or capturing a rook, removes castling rights
+        castling = list(self.castling)
+        for square in [from_, to]:
+            for disallow_castling_item in SQUARE_DISALLOWED_CASTLING.get(square, []):
+                if castling[disallow_castling_item]:
+                    castling[disallow_castling_item] = False
+                    self.key ^= ZOBRIST_CASTLING[disallow_castling_item]
 
-            if move_y not in range(8) or move_x not in range(8):
-                # we're walking off the board
-                continue
+        self.castling = tuple(castling)
 
-            move_square = (8 * move_y) + move_x
+    def get_child_scores(self, moves: List[Move]) -> List[int]:
+        """
+        Returns score after each of moves, without doing the moves
+        """
+        table = self.piece_square_table
+        assert table is not None
+
+        mailbox = self.mailbox
+        score = self.score
+        scores: List[int] = []
+
+        for move in moves:
+            from_ = move & 63
+            to = (move >> MOVE_TO_SHIFT) & 63
+            promotion = (move >> MOVE_PROMOTION_SHIFT) & 15
+            piece_type = mailbox[from_]
+
+            child_score = (
+                score
+                - table[piece_type][from_]
+                + table[promotion or piece_type][to]
+                - table[mailbox[to]][to]
+            )
 
-            if self.get_piece_color(move_square) == self.turn:
-                # we're about to capture our own piece
-                continue
+            flag = move >> MOVE_FLAG_SHIFT
 
-            if self.turn == Color.WHITE:
-                disallow_castling = [Castling.WHITE_SHORT, Castling.WHITE_LONG]
-            else:
-                disallow_castling = [Castling.BLACK_SHORT, Castling.BLACK_LONG]
+            if flag == MoveFlag.EN_PASSENT:
+                captured_square = to - 8 * PAWN_DELTA_Y[self.turn]
+                child_score -= table[mailbox[captured_square]][captured_square]
 
-            child = self.move_piece(
-                square,
-                move_square,
-                disallow_castling=disallow_castling,
-            )
+            elif flag == MoveFlag.CASTLING:
+                rook_values = table[ROOK_PIECE_TYPES[self.turn]]
+                rook_from, rook_to = CASTLING_ROOK_SQUARES[to]
+                child_score += rook_values[rook_to] - rook_values[rook_from]
 
-            children.append(child)
+            scores.append(child_score)
 
-        return children
+        return scores
 
-    def get_range_moves_one_direction(
-        self,
-        square: int,
-        dx: int,
-        dy: int,
-        disallow_castling: Optional[List[Castling]] = None,
-    ) -> List["Board"]:
-        x = square % 8
-        y = square // 8
-
-        if dx > 0:
-            max_dx = 7 - x
-        elif dx < 0:
-            max_dx = x
+    def make_move(self, move: Move) -> None:
+        """
+        Changes board by doing move, which should be legal for the player to move.
+        Use unmake_move() to revert it.
+        """
+        from_ = move & 63
+        to = (move >> MOVE_TO_SHIFT) & 63
+        promotion = (move >> MOVE_PROMOTION_SHIFT) & 15
+        flag = move >> MOVE_FLAG_SHIFT
+
+        turn = self.turn
+        opponent = OPPONENT[turn]
+        bitboards = self.bitboards
+        occupied = self.occupied
+        mailbox = self.mailbox
+        from_bit = 1 << from_
+        to_bit = 1 << to
+
+        piece_type = mailbox[from_]
+        captured = mailbox[to]
+
+        key = self.key ^ ZOBRIST_BLACK_TO_MOVE ^ ZOBRIST_PIECES[piece_type][from_]
+
+        # before the move changes the pawns that could capture
+        if self.en_passent_column is not None and self.can_capture_en_passent():
+            key ^= ZOBRIST_EN_PASSENT[self.en_passent_column]
+
+        mailbox[from_] = PieceType.EMPTY
+
+        if captured:
+            bitboards[captured] ^= to_bit
+            occupied[opponent] ^= to_bit
+            key ^= ZOBRIST_PIECES[captured][to]
+            captured_square = to
+
+        elif flag == MoveFlag.EN_PASSENT:
+            captured = PAWN_PIECE_TYPES[opponent]
+            captured_square = to - 8 * PAWN_DELTA_Y[turn]
+            bitboards[captured] ^= 1 << captured_square
+            occupied[opponent] ^= 1 << captured_square
+            mailbox[captured_square] = PieceType.EMPTY
+            key ^= ZOBRIST_PIECES[captured][captured_square]
+
+        if promotion:
+            bitboards[piece_type] ^= from_bit
+            bitboards[promotion] ^= to_bit
+            mailbox[to] = PieceType(promotion)
+            key ^= ZOBRIST_PIECES[promotion][to]
         else:
-            max_dx = 8
+            bitboards[piece_type] ^= from_bit | to_bit
+            mailbox[to] = piece_type
+            key ^= ZOBRIST_PIECES[piece_type][to]
+
+        occupied[turn] ^= from_bit | to_bit
+
+        if piece_type == KING_PIECE_TYPES[turn]:
+            self.king_squares[turn] = to
+
+        if flag == MoveFlag.CASTLING:
+            rook_piece_type = ROOK_PIECE_TYPES[turn]
+            rook_from, rook_to = CASTLING_ROOK_SQUARES[to]
+            rook_bits = (1 << rook_from) | (1 << rook_to)
+            bitboards[rook_piece_type] ^= rook_bits
+            occupied[turn] ^= rook_bits
+            mailbox[rook_from] = PieceType.EMPTY
+            mailbox[rook_to] = rook_piece_type
+            key ^= ZOBRIST_PIECES[rook_piece_type][rook_from]
+            key ^= ZOBRIST_PIECES[rook_piece_type][rook_to]
+
+        self.history.append(
+            (
+                move,
+                piece_type,
+                captured,
+                self.castling,
+                self.en_passent_column,
+                self.key,
+                self.score,
+                self.halfmove_clock,
+            )
+        )
 
-        if dy > 0:
-            max_dy = 7 - y
-        elif dy < 0:
-            max_dy = y
+        if captured or piece_type == PAWN_PIECE_TYPES[turn]:
+            self.halfmove_clock = 0
         else:
-            max_dy = 8
+            self.halfmove_clock += 1
 
-        max_distance = min(max_dx, max_dy)
+        table = self.piece_square_table
+        if table is not None:
+            score = self.score - table[piece_type][from_]
+            score += table[promotion or piece_type][to]
 
-        children: List["Board"] = []
-
-        for distance in range(1, max_distance + 1):
-            move_x = x + (dx * distance)
-            move_y = y + (dy * distance)
+            if captured:
+                score -= table[captured][captured_square]
 
-            move_square = (8 * move_y) + move_x
+            if flag == MoveFlag.CASTLING:
+                rook_values = table[ROOK_PIECE_TYPES[turn]]
+                score += rook_values[rook_to] - rook_values[rook_from]
 
-            target_piece_color = self.get_piece_color(move_square)
+            self.score = score
 
-            if target_piece_color == self.turn:
-                # we cannot take our own piece
-                break
+        if flag == MoveFlag.DOUBLE_PAWN_PUSH:
+            self.en_passent_column = to % 8
 
-            # target square is empty or has opponent piece
-
-            child = self.move_piece(
-                square,
-                move_square,
-                disallow_castling=disallow_castling,
-            )
-
-            children.append(child)
+            # opponent pawns that attack the square the pawn passed
+            passed_square = (from_ + to) // 2
+            opponent_pawns = bitboards[PAWN_PIECE_TYPES[opponent]]
+            if PAWN_ATTACKS[turn][passed_square] & opponent_pawns:
+                key ^= ZOBRIST_EN_PASSENT[self.en_passent_column]
+        else:
+            self.en_passent_column = None
 
-            if target_piece_color == self.turn.opponent():
-                # we captured a piece from the opponent
-                # meaning we cannot move further in same direction
-                break
+        self.key = key
 
-        return children
+        if (from_bit | to_bit) & CASTLING_RIGHTS_BITBOARD:
+            self._update_castling(from_, to)
 
-    def get_rook_moves(self, square: int) -> List["Board"]:
-        disallow_castling = None
+        self.turn = opponent
+        self._legal_moves = None
 
-        if self.turn == Color.WHITE:
-            if square == SQUARE_A1:
-                disallow_castling = [Castling.WHITE_LONG]
-            elif square == SQUARE_H1:
-                disallow_castling = [Castling.WHITE_SHORT]
+    def unmake_move(self) -> None:
+        """
+        Reverts the last move done with make_move()
+        """
+        (
+            move,
+            piece_type,
+            captured,
+            self.castling,
+            self.en_passent_column,
+            self.key,
+            self.score,
+            self.halfmove_clock,
+        ) = self.history.pop()
+
+        from_ = move & 63
+        to = (move >> MOVE_TO_SHIFT) & 63
+        promotion = (move >> MOVE_PROMOTION_SHIFT) & 15
+        flag = move >> MOVE_FLAG_SHIFT
+
+        opponent = self.turn
+        turn = OPPONENT[opponent]
+        bitboards = self.bitboards
+        occupied = self.occupied
+        mailbox = self.mailbox
+        from_bit = 1 << from_
+        to_bit = 1 << to
+
+        if promotion:
+            bitboards[piece_type] ^= from_bit
+            bitboards[promotion] ^= to_bit
         else:
-            if square == SQUARE_A8:
-                disallow_castling = [Castling.BLACK_LONG]
-            elif square == SQUARE_H8:
-                disallow_castling = [Castling.BLACK_SHORT]
+            bitboards[piece_type] ^= from_bit | to_bit
 
-        children: List["Board"] = []
-        for dx, dy in ROOK_DIRECTIONS:
-            children += self.get_range_moves_one_direction(
-                square, dx, dy, disallow_castling=disallow_castling
-            )
-        return children
+        occupied[turn] ^= from_bit | to_bit
+        mailbox[from_] = piece_type
 
-    def get_bishop_moves(self, square: int) -> List["Board"]:
-        children: List["Board"] = []
-        for dx, dy in BISHOP_DIRECTIONS:
-            children += self.get_range_moves_one_direction(square, dx, dy)
-        return children
+        if piece_type == KING_PIECE_TYPES[turn]:
+            self.king_squares[turn] = from_
 
-    def get_queen_moves(self, square: int) -> List["Board"]:
-        children: List["Board"] = []
-        for dx, dy in QUEEN_DIRECTIONS:
-            children += self.get_range_moves_one_direction(square, dx, dy)
-        return children
+        if flag == MoveFlag.EN_PASSENT:
+            captured_square = to - 8 * PAWN_DELTA_Y[turn]
+            bitboards[captured] ^= 1 << captured_square
+            occupied[opponent] ^= 1 << captured_square
+            mailbox[captured_square] = captured
+            mailbox[to] = PieceType.EMPTY
 
-    def get_pawn_capture_moves(self, square: int) -> List["Board"]:
-        x = square % 8
-        y = square // 8
+        elif captured:
+            bitboards[captured] ^= to_bit
+            occupied[opponent] ^= to_bit
+            mailbox[to] = captured
 
-        capture_squares: List[int] = []
-        moves: List["Board"] = []
-
-        pawn_delta = PAWN_DELTA_Y[self.turn]
-
-        if x != 0:
-            left_capture_square = (8 * (y + pawn_delta)) + (x - 1)
-            capture_squares.append(left_capture_square)
+        else:
+            mailbox[to] = PieceType.EMPTY
 
-        if x != 7:
-            right_capture_square = (8 * (y + pawn_delta)) + (x + 1)
-            capture_squares.append(right_capture_square)
+            if flag == MoveFlag.CASTLING:
+                rook_piece_type = ROOK_PIECE_TYPES[turn]
+                rook_from, rook_to = CASTLING_ROOK_SQUARES[to]
+                rook_bits = (1 << rook_from) | (1 << rook_to)
+                bitboards[rook_piece_type] ^= rook_bits
+                occupied[turn] ^= rook_bits
+                mailbox[rook_from] = rook_piece_type
+                mailbox[rook_to] = PieceType.EMPTY
 
-        pre_promotion_y = PRE_PROMOTION_Y[self.turn]
+        self.turn = turn
+        self._legal_moves = None
 
-        for capture_square in capture_squares:
-            if self.get_piece_color(capture_square) == self.turn.opponent():
+    def make_null_move(self) -> None:
+        """
+        Passes the turn to the opponent, the player to move should not be in
+        check. Use unmake_null_move() to revert it.
+        """
+        self.history.append(
+            (
+                NULL_MOVE,
+                PieceType.EMPTY,
+                PieceType.EMPTY,
+                self.castling,
+                self.en_passent_column,
+                self.key,
+                self.score,
+                self.halfmove_clock,
+            )
+        )
 
-                if y == pre_promotion_y:
-                    for piece_type in PROMOTION_PIECE_TYPES[self.turn]:
-                        moves.append(self.promote(square, capture_square, piece_type))
-                else:
-                    moves.append(self.move_piece(square, capture_square))
+        key = self.key ^ ZOBRIST_BLACK_TO_MOVE
+        if self.en_passent_column is not None and self.can_capture_en_passent():
+            key ^= ZOBRIST_EN_PASSENT[self.en_passent_column]
 
-        return moves
+        self.key = key
+        self.en_passent_column = None
+        self.halfmove_clock += 1
+        self.turn = OPPONENT[self.turn]
+        self._legal_moves = None
 
-    def get_pawn_push_moves(self, square: int) -> List["Board"]:
+    def unmake_null_move(self) -> None:
         """
-        Return moves of pawn moving forward including promotion
+        Reverts the last move done with make_null_move()
         """
-        x = square % 8
-        y = square // 8
+        (
+            _,
+            _,
+            _,
+            self.castling,
+            self.en_passent_column,
+            self.key,
+            self.score,
+            self.halfmove_clock,
+        ) = self.history.pop()
+
+        self.turn = OPPONENT[self.turn]
+        self._legal_moves = None
 
-        pawn_delta = PAWN_DELTA_Y[self.turn]
-        forward = (8 * (y + pawn_delta)) + x
+    def get_piece_color(self, square: int) -> Color:
+        square_bit = 1 << square
 
-        start_y = PAWN_START_Y[self.turn]
-        pre_promotion_y = PRE_PROMOTION_Y[self.turn]
+        if self.occupied[Color.WHITE] & square_bit:
+            return Color.WHITE
 
-        moves: List["Board"] = []
+        if self.occupied[Color.BLACK] & square_bit:
+            return Color.BLACK
 
-        if self.get_piece_color(forward) == Color.NOBODY:
-            if y != pre_promotion_y:
-                moves.append(self.move_piece(square, forward))
+        return Color.NOBODY
 
-            if y == start_y:
-                two_forward = (8 * y + (2 * pawn_delta)) + x
-                if self.get_piece_color(two_forward) == Color.NOBODY:
-                    moves.append(
-                        self.move_piece(square, two_forward, en_passent_column=x)
-                    )
+    def get_piece_type(self, square: int) -> PieceType:
+        return self.mailbox[square]
 
-            if y == pre_promotion_y:
-                for piece_type in PROMOTION_PIECE_TYPES[self.turn]:
-                    moves.append(self.promote(square, forward, piece_type))
+    def show(self, *args: Any, **kwargs: Any) -> None:
+        print_board(self, *args, **kwargs)
 
-        return moves
+    def find_pieces(self, piece_type: PieceType) -> List[int]:
+        return list(iter_squares(self.bitboards[piece_type]))
 
-    def get_pawn_en_passent_moves(self, square: int) -> List["Board"]:
-        x = square % 8
-        y = square // 8
+    def get_legal_moves(self, captures_only: bool = False) -> List[Move]:
+        """
+        Returns legal moves for player to move. With captures_only, only
+        captures and promotions are returned. All legal moves are cached until
+        the board changes, callers get a copy they can change.
+        """
+        if captures_only:
+            return self.generate_legal_moves(captures_only=True)
 
-        if not self.en_passent_column:
-            return []
+        if self._legal_moves is None:
+            self._legal_moves = self.generate_legal_moves()
 
-        if y != EN_PASSENT_CAPTURER_Y[self.turn]:
-            return []
+        return self._legal_moves.copy()
 
-        if x not in [self.en_passent_column + 1, self.en_passent_column - 1]:
-            return []
+    def generate_legal_moves(self, captures_only: bool = False) -> List[Move]:
+        """
+        Returns legal moves like get_legal_moves(), without using the cache.
+        Checking pieces and pinned pieces are found once, so moves don't need to
+        be tried out on the board.
+        """
+        turn = self.turn
+        opponent = OPPONENT[turn]
+        bitboards = self.bitboards
+        own = self.occupied[turn]
+        occupied = own | self.occupied[opponent]
+        queens = bitboards[QUEEN_PIECE_TYPES[turn]]
 
-        move_square = (8 * (y + PAWN_DELTA_Y[self.turn])) + self.en_passent_column
+        king_square = self.king_squares[turn]
 
-        if self.fields[move_square] != PieceType.EMPTY:
-            return []
+        # The king can't hide behind itself from sliding pieces.
+        attacked = self.get_attacked_squares(opponent, occupied ^ (1 << king_square))
 
-        en_passent_square = (
-            8 * (EN_PASSENT_CAPTURER_Y[self.turn])
-        ) + self.en_passent_column
+        if captures_only:
+            # pieces other than pawns can only move to squares of opponent
+            piece_allowed = self.occupied[opponent]
+        else:
+            piece_allowed = ~own
 
-        fields = list(self.fields)
-        fields[move_square] = self.fields[square]
-        fields[en_passent_square] = PieceType.EMPTY
-        fields[square] = PieceType.EMPTY
+        targets = KING_ATTACKS[king_square] & piece_allowed & ~attacked
+        moves = [NORMAL_MOVES[king_square][to] for to in iter_squares(targets)]
 
-        move = Board(fields=fields, turn=self.turn.opponent())
-        return [move]
+        checkers = self.get_attackers(king_square, opponent, occupied)
 
-    def get_pawn_moves(self, square: int) -> List["Board"]:
-        return (
-            self.get_pawn_push_moves(square)
-            + self.get_pawn_capture_moves(square)
-            + self.get_pawn_en_passent_moves(square)
-        )
+        if checkers & (checkers - 1):
+            # double check: only the king can move
+            return moves
 
-    def get_white_castling_moves(self) -> List["Board"]:
+        if checkers:
+            # other pieces have to capture the checker or block the check
+            checker_square = checkers.bit_length() - 1
+            allowed = checkers | BETWEEN_BITBOARDS[king_square][checker_square]
+        else:
+            allowed = ~own
 
-        # The king is not currently in check.
-        if self.is_checked(self.turn):
-            return []
+        pins = self.get_pins(king_square)
+        piece_allowed &= allowed
 
-        moves: List["Board"] = []
+        for from_ in iter_squares(bitboards[KNIGHT_PIECE_TYPES[turn]]):
+            # pinned knights can never stay on the pin ray
+            if from_ not in pins:
+                targets = KNIGHT_ATTACKS[from_] & piece_allowed
+                moves += [NORMAL_MOVES[from_][to] for to in iter_squares(targets)]
 
-        # Neither the king nor the rook has previously moved.
-        # There are no pieces between the king and the rook.
-        # The king does not pass through a square that is attacked by an opposing piece.
-        if (
-            self.castling[Castling.WHITE_SHORT]
-            and self.fields[SQUARE_F1] == PieceType.EMPTY
-            and self.fields[SQUARE_G1] == PieceType.EMPTY
-            and not self.is_attacked(SQUARE_F1, self.turn.opponent())
-        ):
-            # we CAN castle short as white
-
-            fields = list(self.fields)
-            fields[SQUARE_E1] = PieceType.EMPTY
-            fields[SQUARE_F1] = PieceType.WHITE_ROOK
-            fields[SQUARE_G1] = PieceType.WHITE_KING
-            fields[SQUARE_H1] = PieceType.EMPTY
-
-            castling = list(self.castling)
-            castling[Castling.WHITE_SHORT] = False
-            castling[Castling.WHITE_LONG] = False
-
-            short_castle_move = Board(
-                turn=self.turn.opponent(),
-                fields=fields,
-                castling=castling,
-            )
+        for from_ in iter_squares(bitboards[ROOK_PIECE_TYPES[turn]] | queens):
+            targets = get_rook_attacks(from_, occupied) & piece_allowed
+            if from_ in pins:
+                targets &= pins[from_]
+            moves += [NORMAL_MOVES[from_][to] for to in iter_squares(targets)]
 
-            moves.append(short_castle_move)
+        for from_ in iter_squares(bitboards[BISHOP_PIECE_TYPES[turn]] | queens):
+            targets = get_bishop_attacks(from_, occupied) & piece_allowed
+            if from_ in pins:
+                targets &= pins[from_]
+            moves += [NORMAL_MOVES[from_][to] for to in iter_squares(targets)]
 
-        # Neither the king nor the rook has previously moved.
-        # There are no pieces between the king and the rook.
-        # The king does not pass through a square that is attacked by an opposing piece.
-        if (
-            self.castling[Castling.WHITE_LONG]
-            and self.fields[SQUARE_B1] == PieceType.EMPTY
-            and self.fields[SQUARE_C1] == PieceType.EMPTY
-            and self.fields[SQUARE_D1] == PieceType.EMPTY
-            and not self.is_attacked(SQUARE_D1, self.turn.opponent())
-        ):
-            # we CAN castle long as white
-
-            fields = list(self.fields)
-            fields[SQUARE_A1] = PieceType.EMPTY
-            fields[SQUARE_C1] = PieceType.WHITE_KING
-            fields[SQUARE_D1] = PieceType.WHITE_ROOK
-            fields[SQUARE_E1] = PieceType.EMPTY
-
-            castling = list(self.castling)
-            castling[Castling.WHITE_SHORT] = False
-            castling[Castling.WHITE_LONG] = False
-
-            long_castle_move = Board(
-                turn=self.turn.opponent(),
-                fields=fields,
-                castling=castling,
-            )
+        moves += self.get_pawn_moves(allowed, pins, captures_only)
 
-            moves.append(long_castle_move)
+        if not checkers and not captures_only:
+            moves += self.get_castling_moves(attacked)
 
         return moves
 
-    def get_black_castling_moves(self) -> List["Board"]:
-        # The king is not currently in check.
-        if self.is_checked(self.turn):
-            return []
-
-        moves: List["Board"] = []
+    def get_pawn_moves(
+        self, allowed: int, pins: Dict[int, int], captures_only: bool = False
+    ) -> List[Move]:
+        """
+        Returns legal pawn moves including promotion and en passent. Pawns can
+        only move to allowed squares, pinned pawns only along their pin ray.
+        With captures_only, pushes are only returned if they promote.
+        """
+        turn = self.turn
+        pawns = self.bitboards[PAWN_PIECE_TYPES[turn]]
+        opponent_occupied = self.occupied[OPPONENT[turn]]
+        empty = ~(self.occupied[Color.BLACK] | self.occupied[Color.WHITE])
+        promotion_row = PROMOTION_ROW_BITBOARDS[turn]
+        delta = 8 * PAWN_DELTA_Y[turn]
+
+        # move all pawns one square forward at the same time
+        if turn == Color.WHITE:
+            single_pushes = (pawns >> 8) & empty
+            double_pushes = (
+                (single_pushes & DOUBLE_PUSH_ROW_BITBOARDS[turn]) >> 8
+            ) & empty
+        else:
+            single_pushes = (pawns << 8) & empty
+            double_pushes = (
+                (single_pushes & DOUBLE_PUSH_ROW_BITBOARDS[turn]) << 8
+            ) & empty
+
+        single_pushes &= allowed
+        double_pushes &= allowed
+
+        if captures_only:
+            single_pushes &= promotion_row
+            double_pushes = 0
+
+        moves = [
+            NORMAL_MOVES[to - delta][to]
+            for to in iter_squares(single_pushes & ~promotion_row)
+        ]
+
+        for to in iter_squares(double_pushes):
+            moves.append(Move.new(to - 2 * delta, to, flag=MoveFlag.DOUBLE_PAWN_PUSH))
+
+        for to in iter_squares(single_pushes & promotion_row):
+            for piece_type in PROMOTION_PIECE_TYPES[turn]:
+                moves.append(Move.new(to - delta, to, promotion=piece_type))
+
+        for from_ in iter_squares(pawns):
+            targets = PAWN_ATTACKS[turn][from_] & opponent_occupied & allowed
+
+            for to in iter_squares(targets & ~promotion_row):
+                moves.append(NORMAL_MOVES[from_][to])
+
+            for to in iter_squares(targets & promotion_row):
+                for piece_type in PROMOTION_PIECE_TYPES[turn]:
+                    moves.append(Move.new(from_, to, promotion=piece_type))
+
+        if pins:
+            moves = [
+                move
+                for move in moves
+                if move & 63 not in pins
+                or pins[move & 63] & (1 << ((move >> MOVE_TO_SHIFT) & 63))
+            ]
 
-        # Neither the king nor the rook has previously moved.
-        # There are no pieces between the king and the rook.
-        # The king does not pass through a square that is attacked by an opposing piece.
-        if (
-            self.castling[Castling.BLACK_SHORT]
-            and self.fields[SQUARE_F8] == PieceType.EMPTY
-            and self.fields[SQUARE_G8] == PieceType.EMPTY
-            and not self.is_attacked(SQUARE_F8, self.turn.opponent())
-        ):
-            # we CAN castle short as black
-
-            fields = list(self.fields)
-            fields[SQUARE_E8] = PieceType.EMPTY
-            fields[SQUARE_F8] = PieceType.BLACK_ROOK
-            fields[SQUARE_G8] = PieceType.BLACK_KING
-            fields[SQUARE_H8] = PieceType.EMPTY
-
-            castling = list(self.castling)
-            castling[Castling.BLACK_SHORT] = False
-            castling[Castling.BLACK_LONG] = False
-
-            short_castle_move = Board(
-                turn=self.turn.opponent(),
-                fields=fields,
-                castling=castling,
-            )
+        if self.en_passent_column is not None:
+            to = (
+                8 * (EN_PASSENT_CAPTURER_Y[turn] + PAWN_DELTA_Y[turn])
+            ) + self.en_passent_column
 
-            moves.append(short_castle_move)
+            if empty & (1 << to):
+                # our pawns that attack the square behind the pawn that just moved
+                capturers = PAWN_ATTACKS[OPPONENT[turn]][to] & pawns
 
-        # Neither the king nor the rook has previously moved.
-        # There are no pieces between the king and the rook.
-        # The king does not pass through a square that is attacked by an opposing piece.
-        if (
-            self.castling[Castling.BLACK_LONG]
-            and self.fields[SQUARE_B8] == PieceType.EMPTY
-            and self.fields[SQUARE_C8] == PieceType.EMPTY
-            and self.fields[SQUARE_D8] == PieceType.EMPTY
-            and not self.is_attacked(SQUARE_D8, self.turn.opponent())
-        ):
-            # we CAN castle long as black
-
-            fields = list(self.fields)
-            fields[SQUARE_A8] = PieceType.EMPTY
-            fields[SQUARE_C8] = PieceType.BLACK_KING
-            fields[SQUARE_D8] = PieceType.BLACK_ROOK
-            fields[SQUARE_E8] = PieceType.EMPTY
-
-            castling = list(self.castling)
-            castling[Castling.BLACK_SHORT] = False
-            castling[Castling.BLACK_LONG] = False
-
-            long_castle_move = Board(
-                turn=self.turn.opponent(),
-                fields=fields,
-                castling=castling,
-            )
-
-            moves.append(long_castle_move)
+                # En passent removes two pawns from a row, which can expose the
+                # king in ways pins don't cover. It is rare, so just try it out.
+                for from_ in iter_squares(capturers):
+                    move = Move.new(from_, to, flag=MoveFlag.EN_PASSENT)
+                    self.make_move(move)
+                    if not self.is_checked(turn):
+                        moves.append(move)
+                    self.unmake_move()
 
         return moves
 
-    def get_castling_moves(self) -> List["Board"]:
+    def get_castling_moves(self, attacked: int) -> List[Move]:
+        """
+        Returns castling moves, attacked contains squares attacked by opponent.
+        The king should not be in check.
+        """
         if self.turn == Color.WHITE:
-            return self.get_white_castling_moves()
+            castling_options = WHITE_CASTLING
         else:
-            return self.get_black_castling_moves()
-
-    def is_attacked_by_knight(self, king_square: int, attacker: Color) -> bool:
-        king_x = king_square % 8
-        king_y = king_square // 8
-
-        for dx, dy in KNIGHT_DELTAS:
-            knight_x = king_x + dx
-            knight_y = king_y + dy
+            castling_options = BLACK_CASTLING
 
-            if knight_y not in range(8) or knight_x not in range(8):
-                continue
+        if not any(self.castling[castling] for castling in castling_options):
+            return []
 
-            knight_square = (8 * knight_y) + knight_x
+        occupied = self.occupied[Color.BLACK] | self.occupied[Color.WHITE]
+        rooks = self.bitboards[ROOK_PIECE_TYPES[self.turn]]
+        moves: List[Move] = []
 
-            if attacker == Color.BLACK:
-                if self.fields[knight_square] == PieceType.BLACK_KNIGHT:
-                    return True
-            else:
-                if self.fields[knight_square] == PieceType.WHITE_KNIGHT:
-                    return True
+        for castling in castling_options:
+            king_from, king_to, rook_from, rook_to = CASTLING_SQUARES[castling]
 
-        return False
+            # Neither the king nor the rook has previously moved.
+            # There are no pieces between the king and the rook.
+            # The king does not pass through or end on an attacked square.
+            if (
+                self.castling[castling]
+                and rooks & (1 << rook_from)
+                and not occupied & CASTLING_EMPTY_BITBOARDS[castling]
+                and not attacked & ((1 << rook_to) | (1 << king_to))
+            ):
+                moves.append(Move.new(king_from, king_to, flag=MoveFlag.CASTLING))
 
-    def is_attacked_by_rook_or_queen(self, king_square: int, attacker: Color) -> bool:
-        king_x = king_square % 8
-        king_y = king_square // 8
+        return moves
 
-        for dx, dy in ROOK_DIRECTIONS:
-            for distance in range(1, 8):
-                piece_x = king_x + (dx * distance)
-                piece_y = king_y + (dy * distance)
+    def get_attackers(self, square: int, attacker: Color, occupied: int) -> int:
+        """
+        Returns bitboard of pieces of attacker that attack square
+        """
+        bitboards = self.bitboards
+        queens = bitboards[QUEEN_PIECE_TYPES[attacker]]
 
-                if piece_y not in range(8) or piece_x not in range(8):
-                    break
+        return (
+            (KNIGHT_ATTACKS[square] & bitboards[KNIGHT_PIECE_TYPES[attacker]])
+            | (
+                PAWN_ATTACKS[OPPONENT[attacker]][square]
+                & bitboards[PAWN_PIECE_TYPES[attacker]]
+            )
+            | (
+                get_rook_attacks(square, occupied)
+                & (bitboards[ROOK_PIECE_TYPES[attacker]] | queens)
+            )
+            | (
+                get_bishop_attacks(square, occupied)
+                & (bitboards[BISHOP_PIECE_TYPES[attacker]] | queens)
+            )
+        )
 
-                piece_square = (8 * piece_y) + piece_x
+    def get_attacked_squares(self, attacker: Color, occupied: int) -> int:
+        """
+        Returns bitboard of squares attacked by attacker, sliding pieces are
+        blocked by occupied squares
+        """
+        bitboards = self.bitboards
+        queens = bitboards[QUEEN_PIECE_TYPES[attacker]]
+        pawns = bitboards[PAWN_PIECE_TYPES[attacker]]
 
-                piece_type = self.fields[piece_square]
+        # pawns attack diagonally forward, unless they stand on the edge
+        left_pawns = pawns & ~COLUMN_BITBOARDS[0]
+        right_pawns = pawns & ~COLUMN_BITBOARDS[7]
+        if attacker == Color.WHITE:
+            attacked = (left_pawns >> 9) | (right_pawns >> 7)
+        else:
+            attacked = (left_pawns << 7) | (right_pawns << 9)
 
-                if piece_type == PieceType.EMPTY:
-                    continue
+        for square in iter_squares(bitboards[KING_PIECE_TYPES[attacker]]):
+            attacked |= KING_ATTACKS[square]
 
-                if attacker == Color.BLACK:
-                    if piece_type in [PieceType.BLACK_ROOK, PieceType.BLACK_QUEEN]:
-                        return True
-                    else:
-                        break
-                else:
-                    if piece_type in [PieceType.WHITE_ROOK, PieceType.WHITE_QUEEN]:
-                        return True
-                    else:
-                        break
-        return False
+        for square in iter_squares(bitboards[KNIGHT_PIECE_TYPES[attacker]]):
+            attacked |= KNIGHT_ATTACKS[square]
 
-    def is_attacked_by_bishop_or_queen(self, king_square: int, attacker: Color) -> bool:
-        king_x = king_square % 8
-        king_y = king_square // 8
+        for square in iter_squares(bitboards[ROOK_PIECE_TYPES[attacker]] | queens):
+            attacked |= get_rook_attacks(square, occupied)
 
-        for dx, dy in BISHOP_DIRECTIONS:
-            for distance in range(1, 8):
-                piece_x = king_x + (dx * distance)
-                piece_y = king_y + (dy * distance)
+        for square in iter_squares(bitboards[BISHOP_PIECE_TYPES[attacker]] | queens):
+            attacked |= get_bishop_attacks(square, occupied)
 
-                if piece_x not in range(8) or piece_y not in range(8):
-                    break
+        return attacked & FULL_BITBOARD
 
-                piece_square = (8 * piece_y) + piece_x
-                piece_type = self.fields[piece_square]
+    def get_pins(self, king_square: int) -> Dict[int, int]:
+        """
+        Returns squares of pieces of player to move that are pinned to their king,
+        with the squares they can still move to: the pin ray up to and
+        including the pinning piece.
+        """
+        turn = self.turn
+        opponent = OPPONENT[turn]
+        bitboards = self.bitboards
+        occupied = self.occupied[Color.BLACK] | self.occupied[Color.WHITE]
+        queens = bitboards[QUEEN_PIECE_TYPES[opponent]]
+
+        pinners = (
+            (bitboards[ROOK_PIECE_TYPES[opponent]] | queens) & ROOK_LINES[king_square]
+        ) | (
+            (bitboards[BISHOP_PIECE_TYPES[opponent]] | queens)
+            & BISHOP_LINES[king_square]
+        )
 
-                if piece_type == PieceType.EMPTY:
-                    continue
+        pins: Dict[int, int] = {}
 
-                if attacker == Color.BLACK:
-                    if piece_type in [PieceType.BLACK_BISHOP, PieceType.BLACK_QUEEN]:
-                        return True
-                    else:
-                        break
-                else:
-                    if piece_type in [PieceType.WHITE_BISHOP, PieceType.WHITE_QUEEN]:
-                        return True
-                    else:
-                        break
+        for pinner in iter_squares(pinners):
+            between = BETWEEN_BITBOARDS[king_square][pinner]
+            blockers = between & occupied
 
-        return False
+            # exactly one piece in between, which is ours
+            if blockers & self.occupied[turn] and not blockers & (blockers - 1):
+                pins[blockers.bit_length() - 1] = between | (1 << pinner)
 
-    def is_attacked_by_pawn(self, king_square: int, attacker: Color) -> bool:
-        king_x = king_square % 8
-        king_y = king_square // 8
+        return pins
 
-        pawn_squares: List[int] = []
-        for dx in [-1, 1]:
-            pawn_x = king_x + dx
-            pawn_y = king_y - PAWN_DELTA_Y[attacker]
+    def is_checked(self, color: Color) -> bool:
+        """
+        Returns whether the king of the specified player is under attack
+        """
+        # TODO color should always be self.turn, remove color argument
 
-            if pawn_x not in range(8) or pawn_y not in range(8):
-                continue
+        assert color != Color.NOBODY
 
-            pawn_square = (8 * pawn_y) + pawn_x
-            pawn_squares.append(pawn_square)
+        return self.is_attacked(self.king_squares[color], OPPONENT[color])
 
-        for pawn_square in pawn_squares:
-            if attacker == Color.BLACK:
-                if self.fields[pawn_square] == PieceType.BLACK_PAWN:
-                    return True
-            else:
-                if self.fields[pawn_square] == PieceType.WHITE_PAWN:
-                    return True
+    def is_attacked(self, square: int, attacker: Color) -> bool:
+        bitboards = self.bitboards
 
-        return False
+        if KNIGHT_ATTACKS[square] & bitboards[KNIGHT_PIECE_TYPES[attacker]]:
+            return True
 
-    def is_attacked_by_king(self, king_square: int, attacker: Color) -> bool:
-        if attacker == Color.WHITE:
-            king_piecetype = PieceType.WHITE_KING
-        else:
-            king_piecetype = PieceType.BLACK_KING
+        # a pawn of attacker attacks square if a pawn of the other color on square
+        # would attack the pawn of attacker
+        if (
+            PAWN_ATTACKS[OPPONENT[attacker]][square]
+            & bitboards[PAWN_PIECE_TYPES[attacker]]
+        ):
+            return True
 
-        x = king_square % 8
-        y = king_square // 8
+        if KING_ATTACKS[square] & bitboards[KING_PIECE_TYPES[attacker]]:
+            return True
 
-        for dx, dy in KING_DELTAS:
-            if (y + dy) not in range(8) or (x + dx) not in range(8):
-                continue
+        occupied = self.occupied[Color.BLACK] | self.occupied[Color.WHITE]
+        queens = bitboards[QUEEN_PIECE_TYPES[attacker]]
 
-            attacking_king_square = (8 * (y + dy)) + (x + dx)
+        # only compute sliding attacks if a slider is on the same line as square
+        rooks = (bitboards[ROOK_PIECE_TYPES[attacker]] | queens) & ROOK_LINES[square]
+        if rooks and get_rook_attacks(square, occupied) & rooks:
+            return True
 
-            if self.fields[attacking_king_square] == king_piecetype:
-                return True
+        bishops = (bitboards[BISHOP_PIECE_TYPES[attacker]] | queens) & BISHOP_LINES[
+            square
+        ]
+        if bishops and get_bishop_attacks(square, occupied) & bishops:
+            return True
 
         return False
 
-    def is_checked(self, color: Color) -> bool:
+    def find_move(self, child: "Board") -> Optional[Move]:
         """
-        Returns whether the king of the specified player is under attack
+        Returns legal move that turns this board into child, if there is one
         """
-        # TODO color should always be self.turn, remove color argument
+        for move in self.get_legal_moves():
+            self.make_move(move)
+            found = self == child
+            self.unmake_move()
 
-        assert color != Color.NOBODY
+            if found:
+                return move
 
-        if color == Color.WHITE:
-            king_squares = self.find_pieces(PieceType.WHITE_KING)
-        else:
-            king_squares = self.find_pieces(PieceType.BLACK_KING)
+        return None
 
-        assert len(king_squares) == 1
-        king_square = king_squares[0]
-
-        return self.is_attacked(king_square, color.opponent())
+    def find_uci_move(self, uci: str) -> Optional[Move]:
+        """
+        Returns legal move in UCI notation, such as "e2e4" or "e7e8q", if there
+        is one
+        """
+        for move in self.get_legal_moves():
+            if move.to_uci() == uci:
+                return move
 
-    def is_attacked(self, square: int, attacker: Color) -> bool:
-        return (
-            self.is_attacked_by_knight(square, attacker)
-            or self.is_attacked_by_rook_or_queen(square, attacker)
-            or self.is_attacked_by_bishop_or_queen(square, attacker)
-            or self.is_attacked_by_pawn(square, attacker)
-            or self.is_attacked_by_king(square, attacker)
-        )
+        return None
 
     def get_moves(self) -> List["Board"]:
-        moves: List["Board"] = []
+        """
+        Returns a new Board for every legal move
+        """
+        children: List["Board"] = []
 
-        if self.turn == Color.WHITE:
-            for square in range(64):
-                piece_type = self.fields[square]
-
-                if piece_type == PieceType.WHITE_KING:
-                    moves += self.get_king_moves(square)
-                elif piece_type == PieceType.WHITE_KNIGHT:
-                    moves += self.get_knight_moves(square)
-                elif piece_type == PieceType.WHITE_ROOK:
-                    moves += self.get_rook_moves(square)
-                elif piece_type == PieceType.WHITE_BISHOP:
-                    moves += self.get_bishop_moves(square)
-                elif piece_type == PieceType.WHITE_QUEEN:
-                    moves += self.get_queen_moves(square)
-                elif piece_type == PieceType.WHITE_PAWN:
-                    moves += self.get_pawn_moves(square)
-        else:
-            for square in range(64):
-                piece_type = self.fields[square]
-
-                if piece_type == PieceType.BLACK_KING:
-                    moves += self.get_king_moves(square)
-                elif piece_type == PieceType.BLACK_KNIGHT:
-                    moves += self.get_knight_moves(square)
-                elif piece_type == PieceType.BLACK_ROOK:
-                    moves += self.get_rook_moves(square)
-                elif piece_type == PieceType.BLACK_BISHOP:
-                    moves += self.get_bishop_moves(square)
-                elif piece_type == PieceType.BLACK_QUEEN:
-                    moves += self.get_queen_moves(square)
-                elif piece_type == PieceType.BLACK_PAWN:
-                    moves += self.get_pawn_moves(square)
-
-        moves += self.get_castling_moves()
-
-        return [move for move in moves if not move.is_checked(self.turn)]
+        for move in self.get_legal_moves():
+            child = self.copy()
+            child.make_move(move)
+            children.append(child)
+
+        return children
+
+    def has_legal_moves(self) -> bool:
+        if self._legal_moves is None:
+            self._legal_moves = self.generate_legal_moves()
+
+        return bool(self._legal_moves)
 
     def is_checkmate(self) -> bool:
         """
         Returns whether the king of the player to move is checkmated
         """
-        moves = self.get_moves()
-        return self.is_checked(self.turn) and len(moves) == 0
+        return not self.has_legal_moves() and self.is_checked(self.turn)
 
     def is_stalemate(self) -> bool:
         """
         Returns whether player to move has no moves but is not in check
         """
-        moves = self.get_moves()
-        return not self.is_checked(self.turn) and len(moves) == 0
+        return not self.has_legal_moves() and not self.is_checked(self.turn)
 
     def count_piece_types(self) -> Dict[PieceType, int]:
-        counts = {piece_type: 0 for piece_type in PieceType}
+        counts = {
+            piece_type: self.bitboards[piece_type].bit_count()
+            for piece_type in PieceType
+        }
 
-        for field in self.fields:
-            counts[field] += 1
+        occupied = self.occupied[Color.BLACK] | self.occupied[Color.WHITE]
+        counts[PieceType.EMPTY] = 64 - occupied.bit_count()
 
         return counts
+
+
+def _board_from_bitboards(
+    bitboards: Tuple[int, ...],
+    turn: int,
+    en_passent_column: Optional[int],
+    castling: Tuple[bool, ...],
+    halfmove_clock: int,
+) -> Board:
+    board = Board.__new__(Board)
+    board.bitboards = list(bitboards)
+    board.occupied = [
+        sum(bitboards[piece_type] for piece_type in COLOR_PIECE_TYPES[color])
+        for color in [Color.BLACK, Color.WHITE]
+    ]
+    board.turn = Color(turn)
+    board.en_passent_column = en_passent_column
+    board.castling = castling
+    board.halfmove_clock = halfmove_clock
+    board.history = []
+    board.mailbox = board.compute_mailbox()
+    board.king_squares = board.compute_king_squares()
+    board._legal_moves = None
+    board.key = board.compute_key()
+    board.piece_square_table = None
+    board.score = 0
+    return board
@@ -112,7 +112,7 @@ def print_board(board: "Board", red: Set[int] = set()) -> None:
                 left = square_colors[8 * y + x - 1]
 
             output += v_split(left=left, right=square_color)
-            output += colorize_piece(board.fields[8 * y + x], bg=square_color)
+            output += colorize_piece(board.mailbox[8 * y + x], bg=square_color)
 
         row_last_square_color = square_colors[8 * y + 7]
 
@@ -1,4 +1,32 @@
-from chessbot.enums import Castling, PieceType
+from typing import Dict, List, Tuple
+
+from chessbot.enums import (
+    SQUARE_A1,
+    SQUARE_A8,
+    SQUARE_B1,
+    SQUARE_B8,
+    SQUARE_C1,
+    SQUARE_C8,
+    SQUARE_D1,
+    SQUARE_D8,
+    SQUARE_E1,
+    SQUARE_E8,
+    SQUARE_F1,
+    SQUARE_F8,
+    SQUARE_G1,
+    SQUARE_G8,
+    SQUARE_H1,
+    SQUARE_H8,
+    Castling,
+    Color,
+    PieceType,
+)
+
+# faster than calling Color.opponent() in hot loops
+OPPONENT = [
+    Color.WHITE,  # BLACK
+    Color.BLACK,  # WHITE
+]
 
 BOARD_START_FIELDS = (
     (
@@ -149,3 +177,253 @@ CASTLING_TO_FEN_CHAR = {
     Castling.WHITE_SHORT: "K",
     Castling.WHITE_LONG: "Q",
 }
+
+
+# square names as used in UCI and PGN notation, such as "e4"
+SQUARE_NAMES = [f"{'abcdefgh'[square % 8]}{8 - square // 8}" for square in range(64)]
+
+PAWN_PIECE_TYPES = [
+    PieceType.BLACK_PAWN,
+    PieceType.WHITE_PAWN,
+]
+
+ROOK_PIECE_TYPES = [
+    PieceType.BLACK_ROOK,
+    PieceType.WHITE_ROOK,
+]
+
+KNIGHT_PIECE_TYPES = [
+    PieceType.BLACK_KNIGHT,
+    PieceType.WHITE_KNIGHT,
+]
+
+KING_PIECE_TYPES = [
+    PieceType.BLACK_KING,
+    PieceType.WHITE_KING,
+]
+
+QUEEN_PIECE_TYPES = [
+    PieceType.BLACK_QUEEN,
+    PieceType.WHITE_QUEEN,
+]
+
+BISHOP_PIECE_TYPES = [
+    PieceType.BLACK_BISHOP,
+    PieceType.WHITE_BISHOP,
+]
+
+COLOR_PIECE_TYPES = [
+    [  # BLACK
+        PieceType.BLACK_PAWN,
+        PieceType.BLACK_ROOK,
+        PieceType.BLACK_KNIGHT,
+        PieceType.BLACK_KING,
+        PieceType.BLACK_QUEEN,
+        PieceType.BLACK_BISHOP,
+    ],
+    [  # WHITE
+        PieceType.WHITE_PAWN,
+        PieceType.WHITE_ROOK,
+        PieceType.WHITE_KNIGHT,
+        PieceType.WHITE_KING,
+        PieceType.WHITE_QUEEN,
+        PieceType.WHITE_BISHOP,
+    ],
+]
+
+
+# Bitboards: bit N is set when square N is part of the set.
+# Square 0 is A8 and square 63 is H1, see enums.py.
+
+FULL_BITBOARD = (1 << 64) - 1
+
+# rows as used in enums.py: row 0 is rank 8, row 7 is rank 1
+ROW_BITBOARDS = [0xFF << (8 * y) for y in range(8)]
+
+COLUMN_BITBOARDS = [0x0101010101010101 << x for x in range(8)]
+
+PROMOTION_ROW_BITBOARDS = [
+    ROW_BITBOARDS[7],  # BLACK
+    ROW_BITBOARDS[0],  # WHITE
+]
+
+# squares a pawn can reach with a single push from its start row
+DOUBLE_PUSH_ROW_BITBOARDS = [
+    ROW_BITBOARDS[2],  # BLACK
+    ROW_BITBOARDS[5],  # WHITE
+]
+
+
+def _build_step_bitboards(deltas: List[Tuple[int, int]]) -> List[int]:
+    bitboards: List[int] = []
+
+    for square in range(64):
+        x = square % 8
+        y = square // 8
+
+        bitboard = 0
+        for dx, dy in deltas:
+            if (x + dx) in range(8) and (y + dy) in range(8):
+                bitboard |= 1 << ((8 * (y + dy)) + (x + dx))
+
+        bitboards.append(bitboard)
+
+    return bitboards
+
+
+def _build_ray_bitboards(dx: int, dy: int) -> List[int]:
+    bitboards: List[int] = []
+
+    for square in range(64):
+        x = square % 8 + dx
+        y = square // 8 + dy
+
+        bitboard = 0
+        while x in range(8) and y in range(8):
+            bitboard |= 1 << ((8 * y) + x)
+            x += dx
+            y += dy
+
+        bitboards.append(bitboard)
+
+    return bitboards
+
+
+KNIGHT_ATTACKS = _build_step_bitboards(KNIGHT_DELTAS)
+
+KING_ATTACKS = _build_step_bitboards(KING_DELTAS)
+
+# squares attacked by a pawn of a given color standing on a square
+PAWN_ATTACKS = [
+    _build_step_bitboards([(-1, 1), (1, 1)]),  # BLACK
+    _build_step_bitboards([(-1, -1), (1, -1)]),  # WHITE
+]
+
+# squares reachable on an empty board, walking in one direction from a square
+RAY_BITBOARDS: Dict[Tuple[int, int], List[int]] = {
+    (dx, dy): _build_ray_bitboards(dx, dy) for dx, dy in QUEEN_DIRECTIONS
+}
+
+# Rays paired with whether they walk towards higher square numbers.
+# That tells us which set bit of a blocker bitboard is closest to the origin.
+ROOK_RAYS = [(RAY_BITBOARDS[(dx, dy)], dx + 8 * dy > 0) for dx, dy in ROOK_DIRECTIONS]
+
+BISHOP_RAYS = [
+    (RAY_BITBOARDS[(dx, dy)], dx + 8 * dy > 0) for dx, dy in BISHOP_DIRECTIONS
+]
+
+# all squares a rook or bishop could reach from a square on an empty board
+ROOK_LINES = [
+    sum(ray_bitboards[square] for ray_bitboards, _ in ROOK_RAYS) for square in range(64)
+]
+
+BISHOP_LINES = [
+    sum(ray_bitboards[square] for ray_bitboards, _ in BISHOP_RAYS)
+    for square in range(64)
+]
+
+
+def _build_between_bitboards() -> List[List[int]]:
+    between = [64 * [0] for _ in range(64)]
+
+    for ray_bitboards in RAY_BITBOARDS.values():
+        for square in range(64):
+            ray = ray_bitboards[square]
+            for other in range(64):
+                if ray & (1 << other):
+                    between[square][other] = ray & ~ray_bitboards[other] & ~(1 << other)
+
+    return between
+
+
+# squares strictly between two squares on the same line, 0 for other squares
+BETWEEN_BITBOARDS = _build_between_bitboards()
+
+
+def _get_ray_attacks(
+    square: int, occupied: int, rays: List[Tuple[List[int], bool]]
+) -> int:
+    attacks = 0
+
+    for ray_bitboards, increasing in rays:
+        ray = ray_bitboards[square]
+        blockers = ray & occupied
+
+        if blockers:
+            # find the blocker closest to square, squares behind it are not attacked
+            if increasing:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= ray_bitboards[blocker]
+
+        attacks |= ray
+
+    return attacks
+
+
+def _build_slider_attacks(
+    rays: List[Tuple[List[int], bool]],
+) -> Tuple[List[int], List[Dict[int, int]]]:
+    """
+    Returns per square a mask of squares that can block the slider and a table
+    of attacked squares, indexed by occupied squares within that mask
+    """
+    masks: List[int] = []
+    tables: List[Dict[int, int]] = []
+
+    for square in range(64):
+        # Squares at the end of a ray don't block any other squares.
+        mask = 0
+        for ray_bitboards, _ in rays:
+            for blocker in range(64):
+                if ray_bitboards[square] & (1 << blocker) and ray_bitboards[blocker]:
+                    mask |= 1 << blocker
+
+        # visit all subsets of mask
+        table: Dict[int, int] = {}
+        occupied = 0
+        while True:
+            table[occupied] = _get_ray_attacks(square, occupied, rays)
+            occupied = (occupied - mask) & mask
+            if occupied == 0:
+                break
+
+        masks.append(mask)
+        tables.append(table)
+
+    return masks, tables
+
+
+# Attacks of sliding pieces are looked up with
+# ROOK_ATTACK_TABLES[square][occupied & ROOK_ATTACK_MASKS[square]]
+ROOK_ATTACK_MASKS, ROOK_ATTACK_TABLES = _build_slider_attacks(ROOK_RAYS)
+
+BISHOP_ATTACK_MASKS, BISHOP_ATTACK_TABLES = _build_slider_attacks(BISHOP_RAYS)
+
+
+# squares that need to be empty for castling
+CASTLING_EMPTY_BITBOARDS = [
+    (1 << SQUARE_F1) | (1 << SQUARE_G1),  # WHITE_SHORT
+    (1 << SQUARE_B1) | (1 << SQUARE_C1) | (1 << SQUARE_D1),  # WHITE_LONG
+    (1 << SQUARE_F8) | (1 << SQUARE_G8),  # BLACK_SHORT
+    (1 << SQUARE_B8) | (1 << SQUARE_C8) | (1 << SQUARE_D8),  # BLACK_LONG
+]
+
+# king from, king to, rook from, rook to
+CASTLING_SQUARES = [
+    (SQUARE_E1, SQUARE_G1, SQUARE_H1, SQUARE_F1),  # WHITE_SHORT
+    (SQUARE_E1, SQUARE_C1, SQUARE_A1, SQUARE_D1),  # WHITE_LONG
+    (SQUARE_E8, SQUARE_G8, SQUARE_H8, SQUARE_F8),  # BLACK_SHORT
+    (SQUARE_E8, SQUARE_C8, SQUARE_A8, SQUARE_D8),  # BLACK_LONG
+]
+
+# castling rights lost when a piece moves from or to a square
+SQUARE_DISALLOWED_CASTLING: Dict[int, List[Castling]] = {
+    SQUARE_A1: [Castling.WHITE_LONG],
+    SQUARE_E1: [Castling.WHITE_SHORT, Castling.WHITE_LONG],
+    SQUARE_H1: [Castling.WHITE_SHORT],
+    SQUARE_A8: [Castling.BLACK_LONG],
+    SQUARE_E8: [Castling.BLACK_SHORT, Castling.BLACK_LONG],
+    SQUARE_H8: [Castling.BLACK_SHORT],
+}
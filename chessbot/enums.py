@@ -113,6 +113,19 @@ class Castling(IntEnum):
     BLACK_LONG = 3
 
 
+class MoveFlag(IntEnum):
+    NORMAL = 0
+    DOUBLE_PAWN_PUSH = 1
+    EN_PASSENT = 2
+    CASTLING = 3
+
+
+class Bound(IntEnum):
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+
 class GameState(IntEnum):
     NORMAL = 0
     STALEMATE = 1
@@ -120,3 +133,4 @@ class GameState(IntEnum):
     INSUFFICIENT_MATERIAL = 3
     REPETITION = 4
     FIFTY_MOVE_RULE = 5
+    MOVE_LIMIT = 6
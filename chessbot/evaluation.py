@@ -0,0 +1,45 @@
+from typing import Dict, List, Optional
+
+from chessbot.enums import PieceType
+
+# Score per PieceType per square, from the perspective of white.
+# Boards keep the sum over all pieces up to date, see Board.score.
+PieceSquareTable = List[List[int]]
+
+# white pieces and black pieces of the same kind
+PIECE_TYPE_PAIRS = [
+    (PieceType.WHITE_PAWN, PieceType.BLACK_PAWN),
+    (PieceType.WHITE_ROOK, PieceType.BLACK_ROOK),
+    (PieceType.WHITE_KNIGHT, PieceType.BLACK_KNIGHT),
+    (PieceType.WHITE_KING, PieceType.BLACK_KING),
+    (PieceType.WHITE_QUEEN, PieceType.BLACK_QUEEN),
+    (PieceType.WHITE_BISHOP, PieceType.BLACK_BISHOP),
+]
+
+
+def new_piece_square_table(
+    piece_values: Dict[PieceType, int],
+    square_values: Optional[Dict[PieceType, List[int]]] = None,
+) -> PieceSquareTable:
+    """
+    Returns table from values of white pieces. Square values are added to the
+    piece value and are listed from a8 to h1, like board squares. Black pieces
+    get the negated values of white pieces on the mirrored square.
+    """
+    if square_values is None:
+        square_values = {}
+
+    table = [64 * [0] for _ in range(13)]
+
+    for white_piece_type, black_piece_type in PIECE_TYPE_PAIRS:
+        value = piece_values.get(white_piece_type, 0)
+        values = square_values.get(white_piece_type, 64 * [0])
+        assert len(values) == 64
+
+        for square in range(64):
+            table[white_piece_type][square] = value + values[square]
+
+            # flip vertically: a8 becomes a1
+            table[black_piece_type][square ^ 56] = -value - values[square]
+
+    return table
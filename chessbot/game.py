@@ -1,14 +1,38 @@
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from chessbot.board import Board
 from chessbot.enums import Color, GameState, PieceType
+from chessbot.move import Move
 from chessbot.players.base import BasePlayer
 
 
 class Game:
-    def __init__(self, black: BasePlayer, white: BasePlayer) -> None:
+    def __init__(
+        self,
+        black: BasePlayer,
+        white: BasePlayer,
+        board: Optional[Board] = None,
+        show: bool = True,
+        max_plies: Optional[int] = None,
+    ) -> None:
+        """
+        Game starts at board, or the start position if board is None. Without
+        show, nothing is printed. Games that last longer than max_plies end in
+        a draw.
+        """
+        if board is None:
+            board = Board.start()
+
         self.players = [black, white]
-        self.board = Board.start()
+        self.start_board = board.copy()
+        self.board = board.copy()
+        self.moves: List[Move] = []
+
+        # number of times each position occurred, by Zobrist hash
+        self.position_counts: Dict[int, int] = {self.board.key: 1}
+
+        self.show = show
+        self.max_plies = max_plies
 
     def get_player_to_move(self) -> BasePlayer:
         return self.players[self.board.turn]
@@ -17,13 +41,18 @@ class Game:
         """
         Returns game state and player that won
         """
-        moves = self.board.get_moves()
-        if len(moves) == 0:
-            if self.board.is_checked(self.board.turn):
-                return GameState.CHECKMATE, self.board.turn.opponent()
+        if self.board.is_checkmate():
+            return GameState.CHECKMATE, self.board.turn.opponent()
 
+        if self.board.is_stalemate():
             return GameState.STALEMATE, None
 
+        if self.position_counts[self.board.key] >= 3:
+            return GameState.REPETITION, None
+
+        if self.board.halfmove_clock >= 100:
+            return GameState.FIFTY_MOVE_RULE, None
+
         num_pieces = self.board.count_piece_types()
 
         if (
@@ -45,10 +74,17 @@ class Game:
             ):
                 return GameState.INSUFFICIENT_MATERIAL, None
 
+        if self.max_plies is not None and len(self.moves) >= self.max_plies:
+            return GameState.MOVE_LIMIT, None
+
         return GameState.NORMAL, None
 
-    def play(self) -> None:
-        self.board.show()
+    def play(self) -> Tuple[GameState, Optional[Color]]:
+        """
+        Plays until the game ends, returns game state and player that won
+        """
+        if self.show:
+            self.board.show()
 
         while True:
             game_state, winner = self.get_game_state()
@@ -57,11 +93,27 @@ class Game:
                 break
 
             player_to_move = self.get_player_to_move()
-            self.board = player_to_move.do_move(self.board)
+            child = player_to_move.do_move(self.board)
+
+            move = self.board.find_move(child)
+            assert move is not None
+
+            self.board.make_move(move)
+            self.moves.append(move)
+
+            key = self.board.key
+            self.position_counts[key] = self.position_counts.get(key, 0) + 1
+
+            if self.show:
+                self.board.show()
+
+        if self.show:
             self.board.show()
+            self.print_result(game_state, winner)
 
-        self.board.show()
+        return game_state, winner
 
+    def print_result(self, game_state: GameState, winner: Optional[Color]) -> None:
         if game_state == GameState.NORMAL:
             # Should never happen
             assert False
@@ -81,3 +133,6 @@ class Game:
 
         elif game_state == GameState.FIFTY_MOVE_RULE:
             print("Draw by the 50 move rule.")
+
+        elif game_state == GameState.MOVE_LIMIT:
+            print("Draw by move limit.")
@@ -0,0 +1,79 @@
+from typing import List
+
+from chessbot.constants import PIECE_TYPE_TO_FEN_CHAR, SQUARE_NAMES
+from chessbot.enums import MoveFlag, PieceType
+
+MOVE_TO_SHIFT = 6
+MOVE_PROMOTION_SHIFT = 12
+MOVE_FLAG_SHIFT = 16
+
+
+class Move(int):
+    """
+    A move packed into an int:
+    - bits 0-5: square the piece moves from
+    - bits 6-11: square the piece moves to
+    - bits 12-15: PieceType the pawn promotes to, or EMPTY
+    - bits 16-17: MoveFlag
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def new(
+        from_: int,
+        to: int,
+        promotion: PieceType = PieceType.EMPTY,
+        flag: MoveFlag = MoveFlag.NORMAL,
+    ) -> "Move":
+        return Move(
+            from_
+            | (to << MOVE_TO_SHIFT)
+            | (promotion << MOVE_PROMOTION_SHIFT)
+            | (flag << MOVE_FLAG_SHIFT)
+        )
+
+    @property
+    def from_(self) -> int:
+        return self & 63
+
+    @property
+    def to(self) -> int:
+        return (self >> MOVE_TO_SHIFT) & 63
+
+    @property
+    def promotion(self) -> PieceType:
+        return PieceType((self >> MOVE_PROMOTION_SHIFT) & 15)
+
+    @property
+    def flag(self) -> MoveFlag:
+        return MoveFlag(self >> MOVE_FLAG_SHIFT)
+
+    def to_uci(self) -> str:
+        """
+        Returns move in UCI notation, such as "e2e4" or "e7e8q"
+        """
+        uci = SQUARE_NAMES[self.from_] + SQUARE_NAMES[self.to]
+
+        if self.promotion != PieceType.EMPTY:
+            uci += PIECE_TYPE_TO_FEN_CHAR[self.promotion].lower()
+
+        return uci
+
+    def __repr__(self) -> str:
+        return f"Move({self.to_uci()})"
+
+    def __str__(self) -> str:
+        return self.to_uci()
+
+
+# Passes the turn, see Board.make_null_move(). A real move never has the same
+# from and to square.
+NULL_MOVE = Move(0)
+
+
+# Normal moves indexed by from and to square. The move generator uses these
+# to prevent creating millions of identical Move objects.
+NORMAL_MOVES: List[List[Move]] = [
+    [Move.new(from_, to) for to in range(64)] for from_ in range(64)
+]
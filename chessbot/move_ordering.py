@@ -0,0 +1,145 @@
+from array import array
+from typing import List, Optional
+
+from chessbot.board import Board
+from chessbot.enums import MoveFlag, PieceType
+from chessbot.move import MOVE_FLAG_SHIFT, MOVE_PROMOTION_SHIFT, MOVE_TO_SHIFT, Move
+
+# piece values for ordering captures, indexed by PieceType
+MVV_LVA_PIECE_VALUES = [0, 1, 5, 3, 100, 9, 3, 1, 5, 3, 100, 9, 3]
+
+# Ordering scores of move kinds, every kind comes before the next one.
+# History scores of quiet moves stay below KILLER_MOVE_SCORE.
+HASH_MOVE_SCORE = 1 << 40
+CAPTURE_SCORE = 1 << 39
+KILLER_MOVE_SCORE = 1 << 38
+
+KILLER_MOVES_PER_PLY = 2
+
+# History scores are halved when one of them reaches this, so recent cutoffs
+# weigh more than old ones.
+MAX_HISTORY_SCORE = 1 << 24
+
+# size of butterfly history: a score per color, from square and to square
+HISTORY_SIZE = 2 * 64 * 64
+
+
+def get_mvv_lva_score(board: Board, move: Move) -> int:
+    """
+    Returns score for ordering captures: most valuable victim first, then
+    least valuable attacker first. Promotions count as capturing the new piece.
+    """
+    if move.flag == MoveFlag.EN_PASSENT:
+        victim = PieceType.BLACK_PAWN
+    else:
+        victim = board.mailbox[move.to]
+
+    score = 1000 * MVV_LVA_PIECE_VALUES[victim]
+    score += 1000 * MVV_LVA_PIECE_VALUES[move.promotion]
+    return score - MVV_LVA_PIECE_VALUES[board.mailbox[move.from_]]
+
+
+def is_quiet_move(board: Board, move: Move) -> bool:
+    """
+    Returns whether move captures nothing and doesn't promote
+    """
+    return (
+        board.mailbox[move.to] == PieceType.EMPTY
+        and move.flag != MoveFlag.EN_PASSENT
+        and move.promotion == PieceType.EMPTY
+    )
+
+
+class MoveOrdering:
+    def __init__(self, killer_moves: bool, history: bool) -> None:
+        """
+        Orders moves inside the search: hash move first, then captures by
+        MVV-LVA, then killer moves that caused a cutoff at the same ply, then
+        the other quiet moves by how often they caused cutoffs anywhere in the
+        tree. Killer moves and history can be enabled separately.
+        """
+        self.killer_moves = killer_moves
+        self.history = history
+
+        # killer moves indexed by ply, most recent first
+        self.killers: List[List[Move]] = []
+
+        self.history_scores = array("q", bytes(8 * HISTORY_SIZE))
+
+    def start_search(self) -> None:
+        """
+        Forgets killer moves and ages history scores, so scores of the previous
+        search still help, but new cutoffs soon outweigh them
+        """
+        self.killers = []
+        self.age_history()
+
+    def age_history(self) -> None:
+        history_scores = self.history_scores
+        for index in range(HISTORY_SIZE):
+            history_scores[index] >>= 1
+
+    def order_moves(
+        self, board: Board, moves: List[Move], hash_move: Optional[Move], ply: int
+    ) -> List[Move]:
+        """
+        Returns moves sorted from most to least promising, ties keep the move
+        generation order
+        """
+        killers: List[Move] = []
+        if ply < len(self.killers):
+            killers = self.killers[ply]
+
+        # index of butterfly history is color, from square and to square
+        history_offset = board.turn << 12
+        history_scores = self.history_scores
+        use_history = self.history
+        mailbox = board.mailbox
+
+        scores: List[int] = []
+        for move in moves:
+            if move == hash_move:
+                score = HASH_MOVE_SCORE
+            elif (
+                # same as not is_quiet_move(), without the Move properties
+                mailbox[(move >> MOVE_TO_SHIFT) & 63]
+                or (move >> MOVE_PROMOTION_SHIFT) & 15
+                or move >> MOVE_FLAG_SHIFT == MoveFlag.EN_PASSENT
+            ):
+                score = CAPTURE_SCORE + get_mvv_lva_score(board, move)
+            elif move in killers:
+                score = KILLER_MOVE_SCORE - killers.index(move)
+            elif use_history:
+                score = history_scores[history_offset | (move & 4095)]
+            else:
+                score = 0
+            scores.append(score)
+
+        order = sorted(range(len(moves)), key=lambda index: -scores[index])
+        return [moves[index] for index in order]
+
+    def add_cutoff(self, board: Board, move: Move, ply: int, depth: int) -> None:
+        """
+        Remembers that quiet move caused a beta cutoff, searched with depth
+        remaining plies
+        """
+        if not is_quiet_move(board, move):
+            return
+
+        if self.killer_moves:
+            while len(self.killers) <= ply:
+                self.killers.append([])
+
+            killers = self.killers[ply]
+            if move in killers:
+                killers.remove(move)
+            killers.insert(0, move)
+            del killers[KILLER_MOVES_PER_PLY:]
+
+        if self.history:
+            # cutoffs close to the root save more nodes
+            index = (board.turn << 12) | (move & 4095)
+            self.history_scores[index] += depth * depth
+
+            if self.history_scores[index] >= MAX_HISTORY_SCORE:
+                self.age_history()
@@ -0,0 +1,70 @@
+from typing import Dict, List, Tuple
+
+from chessbot.board import Board
+from chessbot.move import Move
+
+# Positions with known move tree sizes, starting at depth 1
+# Source: https://www.chessprogramming.org/Perft_Results
+PERFT_SUITE: Dict[str, Tuple[str, List[int]]] = {
+    "start": (
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        [20, 400, 8902, 197281, 4865609, 119060324],
+    ),
+    "kiwipete": (
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603, 193690690],
+    ),
+    "position3": (
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        [14, 191, 2812, 43238, 674624, 11030083],
+    ),
+    "position4": (
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        [6, 264, 9467, 422333, 15833292],
+    ),
+    "position5": (
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        [44, 1486, 62379, 2103487, 89941194],
+    ),
+    "position6": (
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594, 164075551],
+    ),
+}
+
+
+def perft(board: Board, depth: int) -> int:
+    """
+    Returns number of move sequences of length depth starting at board
+    """
+    if depth == 0:
+        return 1
+
+    moves = board.get_legal_moves()
+
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+
+    return nodes
+
+
+def divide(board: Board, depth: int) -> List[Tuple[Move, int]]:
+    """
+    Returns perft result below every legal move of board
+    """
+    assert depth >= 1
+
+    results: List[Tuple[Move, int]] = []
+
+    for move in board.get_legal_moves():
+        board.make_move(move)
+        results.append((move, perft(board, depth - 1)))
+        board.unmake_move()
+
+    return results
@@ -0,0 +1,137 @@
+from typing import Dict, List
+
+from chessbot.board import Board
+from chessbot.constants import (
+    KING_PIECE_TYPES,
+    PAWN_PIECE_TYPES,
+    PIECE_TYPE_TO_FEN_CHAR,
+    SQUARE_NAMES,
+)
+from chessbot.enums import Color, MoveFlag
+from chessbot.move import Move
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# order of the Seven Tag Roster, other tags come after these
+PGN_TAG_ORDER = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
+
+
+def get_san(board: Board, move: Move) -> str:
+    """
+    Returns move in Standard Algebraic Notation, such as "Nbd2", "exd5" or "O-O".
+    The move should be legal on board.
+    """
+    legal_moves = board.get_legal_moves()
+    assert move in legal_moves
+
+    piece_type = board.get_piece_type(move.from_)
+
+    if move.flag == MoveFlag.CASTLING:
+        if move.to % 8 == 6:
+            san = "O-O"
+        else:
+            san = "O-O-O"
+
+    elif piece_type == PAWN_PIECE_TYPES[board.turn]:
+        san = ""
+        if move.from_ % 8 != move.to % 8:
+            san = SQUARE_NAMES[move.from_][0] + "x"
+        san += SQUARE_NAMES[move.to]
+
+        if move.promotion:
+            san += "=" + PIECE_TYPE_TO_FEN_CHAR[move.promotion].upper()
+
+    else:
+        san = PIECE_TYPE_TO_FEN_CHAR[piece_type].upper()
+
+        if piece_type != KING_PIECE_TYPES[board.turn]:
+            # other pieces of the same type that can move to the same square
+            ambiguous = [
+                other.from_
+                for other in legal_moves
+                if other.to == move.to
+                and other.from_ != move.from_
+                and board.get_piece_type(other.from_) == piece_type
+            ]
+
+            if ambiguous:
+                file = SQUARE_NAMES[move.from_][0]
+                rank = SQUARE_NAMES[move.from_][1]
+                if all(SQUARE_NAMES[square][0] != file for square in ambiguous):
+                    san += file
+                elif all(SQUARE_NAMES[square][1] != rank for square in ambiguous):
+                    san += rank
+                else:
+                    san += file + rank
+
+        if board.get_piece_type(move.to):
+            san += "x"
+        san += SQUARE_NAMES[move.to]
+
+    board.make_move(move)
+    if board.is_checked(board.turn):
+        if board.has_legal_moves():
+            san += "+"
+        else:
+            san += "#"
+    board.unmake_move()
+
+    return san
+
+
+def format_pgn(tags: Dict[str, str], fen: str, moves: List[Move], result: str) -> str:
+    """
+    Returns game in PGN format. The game starts at the position of fen, move
+    numbers continue from its fullmove number.
+    """
+    tags = {**tags, "Result": result}
+
+    # Board doesn't keep the fullmove number, so take it from the FEN.
+    # It starts at 1, strict PGN readers reject a FEN tag with 0.
+    split_fen = fen.split(" ")
+    fullmove_number = max(int(split_fen[5]), 1)
+    split_fen[5] = str(fullmove_number)
+
+    if split_fen[:4] != START_FEN.split(" ")[:4]:
+        tags["SetUp"] = "1"
+        tags["FEN"] = " ".join(split_fen)
+
+    tag_names = [name for name in PGN_TAG_ORDER if name in tags]
+    tag_names += [name for name in tags if name not in PGN_TAG_ORDER]
+
+    pgn = ""
+    for name in tag_names:
+        value = tags[name].replace("\\", "\\\\").replace('"', '\\"')
+        pgn += f'[{name} "{value}"]\n'
+    pgn += "\n"
+
+    board = Board.from_fen(fen)
+    tokens: List[str] = []
+
+    # when black moves first, white's first move has the next move number
+    black_first = int(board.turn == Color.BLACK)
+
+    for ply, move in enumerate(moves):
+        if board.turn == Color.WHITE:
+            tokens.append(f"{fullmove_number + (ply + black_first) // 2}.")
+        elif ply == 0:
+            tokens.append(f"{fullmove_number}...")
+
+        tokens.append(get_san(board, move))
+        board.make_move(move)
+
+    tokens.append(result)
+
+    # PGN lines should not exceed 80 characters
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > 80:
+            pgn += line + "\n"
+            line = token
+        elif line:
+            line += " " + token
+        else:
+            line = token
+
+    pgn += line + "\n"
+    return pgn
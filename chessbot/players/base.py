@@ -1,84 +1,1029 @@
-from datetime import datetime
-from typing import List
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.sharedctypes import Synchronized
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from chessbot.bitbase import (
+    BITBASE_DRAW,
+    BITBASE_WIN,
+    Bitbases,
+    get_win_progress,
+)
 from chessbot.board import Board
-from chessbot.enums import Color
+from chessbot.constants import PAWN_PIECE_TYPES
+from chessbot.enums import Bound, Color
+from chessbot.evaluation import PieceSquareTable
+from chessbot.move import NULL_MOVE, Move
+from chessbot.move_ordering import MoveOrdering, get_mvv_lva_score, is_quiet_move
+from chessbot.players import parallel
+from chessbot.polyglot import OpeningBook
+from chessbot.search_stats import (
+    DepthStats,
+    HumanReporter,
+    SearchReporter,
+    SearchStats,
+    SilentReporter,
+)
+from chessbot.transposition_table import TranspositionTable
 
 STALEMATE_HEURISTIC = 0
+
+# Being mated scores -(CHECKMATE_HEURISTIC - ply), where ply is the distance of
+# the mate from the root, so faster mates score higher. Heuristics of at least
+# MIN_CHECKMATE_HEURISTIC, in absolute value, are mates.
 CHECKMATE_HEURISTIC = 999999
+MAX_MATE_PLY = 1000
+MIN_CHECKMATE_HEURISTIC = CHECKMATE_HEURISTIC - MAX_MATE_PLY
+
+# Won bitbase positions score above any material advantage, but below mate.
+BITBASE_WIN_HEURISTIC = 100000
+
+# bound outside of any possible heuristic
+INFINITE_HEURISTIC = CHECKMATE_HEURISTIC + 1
+
+DEFAULT_TRANSPOSITION_TABLE_MB = 16
+
+# number of nodes between checks whether the search should stop
+STOP_CHECK_INTERVAL = 1024
+
+# Null move pruning searches a pass with this many plies less. Positions where
+# a pass still fails high are not searched any further.
+NULL_MOVE_REDUCTION = 2
+
+# Late move reductions search quiet moves with one ply less, if they come after
+# the first few moves of a node with at least LMR_MIN_DEPTH plies left.
+LMR_MIN_DEPTH = 3
+LMR_FULL_DEPTH_MOVES = 3
+
+# Check extensions stop when a line is this many times longer than the depth
+# of the iteration.
+MAX_EXTENSION_FACTOR = 2
+
+
+class SearchStopped(Exception):
+    """
+    Raised inside the search when it runs out of time or nodes
+    """
 
 
 class BasePlayer:
     def __init__(self, color: Color) -> None:
         assert color != Color.NOBODY
-        self.color = color
+        self.color: Color = color
 
     def do_move(self, board: Board) -> Board:
         raise NotImplementedError
 
 
 class BaseBot(BasePlayer):
-    def __init__(self, color: Color, depth: int) -> None:
+    # Bots that set this get heuristic() for free, otherwise they should
+    # override heuristic()
+    piece_square_table: Optional[PieceSquareTable] = None
+
+    def __init__(
+        self,
+        color: Color,
+        depth: int,
+        transposition_table_mb: int = DEFAULT_TRANSPOSITION_TABLE_MB,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+        workers: int = 1,
+        quiescence: bool = False,
+        opening_book: Optional[str] = None,
+        bitbases: Optional[str] = None,
+        reporter: Optional[SearchReporter] = None,
+        measure_time: bool = False,
+        killer_moves: bool = False,
+        history_heuristic: bool = False,
+        null_move_pruning: bool = False,
+        late_move_reductions: bool = False,
+        check_extensions: bool = False,
+    ) -> None:
+        """
+        Searches up to depth, or less when time_limit (in seconds) or node_limit
+        runs out first. With more than one worker, root moves are searched in
+        parallel by a pool of worker processes. With quiescence, leaves are
+        extended with captures and promotions until the position is quiet.
+        Positions found in the Polyglot book at path opening_book are not
+        searched. Positions with material that has a bitbase file in directory
+        bitbases get an exact result without searching them. Search progress and
+        statistics go to reporter, which prints them by default. With
+        measure_time, statistics include time spent in move generation and
+        evaluation, which slows down the search a little. Moves are searched in
+        move generation order after the hash move, unless killer_moves or
+        history_heuristic enables the move ordering of MoveOrdering.
+        Without null_move_pruning, late_move_reductions and check_extensions
+        every move is searched to full depth.
+        """
+        assert workers >= 1
         self.depth = depth
+        self.quiescence = quiescence
+
+        self.null_move_pruning = null_move_pruning
+        self.late_move_reductions = late_move_reductions
+        self.check_extensions = check_extensions
+        self.selective_search = late_move_reductions or check_extensions
+
+        # Leaves are scored from the piece-square table of their parent
+        # without doing the moves, see negamax(). Checks can't be extended then.
+        self.batch_leaves = (
+            self.piece_square_table is not None
+            and not quiescence
+            and bitbases is None
+            and not check_extensions
+        )
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.workers = workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.shared_best_heuristic: Optional["Synchronized[int]"] = None
+
+        # Nodes searched by all workers in the current iteration, so they share
+        # one node budget. Workers get it as shared_nodes.
+        self.shared_worker_nodes: Optional["Synchronized[int]"] = None
+        self.shared_nodes: Optional["Synchronized[int]"] = None
+
+        # part of self.nodes that was already added to shared_nodes
+        self.shared_nodes_added = 0
+        self.opening_book: Optional[OpeningBook] = None
+        if opening_book is not None:
+            self.opening_book = OpeningBook(opening_book)
+        self.bitbases_directory = bitbases
+        self.bitbases: Optional[Bitbases] = None
+        if bitbases is not None:
+            self.bitbases = Bitbases.open(bitbases)
+        self.bitbase_cutoffs = True
+
+        self.move_ordering: Optional[MoveOrdering] = None
+        if killer_moves or history_heuristic:
+            self.move_ordering = MoveOrdering(killer_moves, history_heuristic)
+
+        # length of Board.history at the root, used to find the ply of a node
+        self.root_history_length = 0
+
+        # Zobrist hashes of positions that occurred in the game before the root
+        self.game_position_keys: Set[int] = set()
+
+        # check extensions are not done at this ply or deeper
+        self.max_extension_ply = 0
+
+        self.transposition_table_mb = transposition_table_mb
+        self.transposition_table = TranspositionTable(transposition_table_mb)
         self.nodes = 0
-        self.search_start = datetime.now()
+        self.total_nodes = 0
+
+        if reporter is None:
+            reporter = HumanReporter()
+        self.reporter = reporter
+        self.measure_time = measure_time
+
+        # statistics of the last or currently running search
+        self.stats = SearchStats(type(self).__name__)
+
+        # set from another thread by request_stop()
+        self.stop_requested = False
+        self.deadline: Optional[float] = None
+        self.stop_allowed = False
+        self.next_stop_check = STOP_CHECK_INTERVAL
         super().__init__(color)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes get a copy of this bot with an empty
+        # transposition table and without the pool of workers or the book.
+        # They map the bitbase files themselves.
+        state = self.__dict__.copy()
+        del state["transposition_table"]
+        state["executor"] = None
+        state["shared_best_heuristic"] = None
+        state["shared_worker_nodes"] = None
+        state["shared_nodes"] = None
+        state["opening_book"] = None
+        state["bitbases"] = None
+        state["reporter"] = SilentReporter()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.transposition_table = TranspositionTable(self.transposition_table_mb)
+
+        if self.bitbases_directory is not None:
+            self.bitbases = Bitbases.open(self.bitbases_directory)
+
+    def close(self) -> None:
+        """
+        Stops worker processes, closes opening book and bitbases, if any
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+        if self.opening_book is not None:
+            self.opening_book.close()
+            self.opening_book = None
+
+        if self.bitbases is not None:
+            self.bitbases.close()
+            self.bitbases = None
+
     def do_move(self, board: Board) -> Board:
+        best_move = self.search(board)
+
+        child = board.copy()
+        child.make_move(best_move)
+        return child
+
+    def order_root_moves(self, board: Board, moves: List[Move]) -> List[int]:
+        """
+        Returns indexes of moves, most promising move first
+        """
+        scores: List[int] = []
+        for move in moves:
+            board.make_move(move)
+            scores.append(-self.evaluate(board))
+            board.unmake_move()
+
+        # sort is stable, so equal scores keep the move generation order
+        return sorted(range(len(moves)), key=lambda index: -scores[index])
+
+    def search(self, board: Board) -> Move:
+        """
+        Returns best move for the player to move, using iterative deepening.
+        If multiple moves are equally good, returns the one that comes first in
+        the move generation order.
+        """
         self.nodes = 0
-        self.search_start = datetime.now()
+        self.transposition_table.reset_counters()
+
+        start = time.perf_counter()
+        self.stats = SearchStats(type(self).__name__)
+
+        if self.opening_book is not None:
+            book_move = self.opening_book.choose_move(board)
+            if book_move is not None:
+                self.stats.book_move = book_move
+                self.stats.seconds = time.perf_counter() - start
+                self.reporter.finish(self.stats)
+                return book_move
 
-        moves = board.get_moves()
+        self.deadline = None
+        if self.time_limit is not None:
+            self.deadline = time.monotonic() + self.time_limit
+
+        # we need a move from at least one finished iteration
+        self.stop_allowed = False
+        self.next_stop_check = STOP_CHECK_INTERVAL
+
+        # Board.copy() drops the history, remember which positions occurred
+        self.game_position_keys = get_history_keys(board)
+
+        # we search on a copy, so the passed board doesn't change
+        board = board.copy()
+        board.set_piece_square_table(self.piece_square_table)
+        self.set_bitbase_cutoffs(board)
+        self.root_history_length = len(board.history)
+
+        if self.move_ordering is not None:
+            self.move_ordering.start_search()
+
+        moves = board.get_legal_moves()
         assert moves
 
-        best_heuristic = -999999  # very bad
-        best_move: Board = Board.empty()  # value doesn't matter
+        order = self.order_root_moves(board, moves)
+        best_index = order[0]
+
+        self.reporter.start(self.stats)
 
-        print(f"{type(self).__name__} is thinking:")
-        for i, move in enumerate(moves):
-            heur = self.minimax(move, self.depth, False)
+        if self.workers > 1:
+            search_root = self.search_root_parallel
+        else:
+            search_root = self.search_root
+
+        for depth in range(self.depth + 1):
+            iteration_start = time.perf_counter()
+            iteration_start_nodes = self.nodes
+
+            try:
+                heuristics, best_index = search_root(board, moves, order, depth)
+            except SearchStopped:
+                break
 
-            speed = self.search_speed()
-            print(
-                f"{i+1:>2}/{len(moves):>2} | heur = {heur:>4} | {speed:7.0f} nodes/sec"
+            # Next iteration searches best move first, then the other moves
+            # ordered by heuristic of this iteration.
+            order.remove(best_index)
+            order.sort(key=lambda index: -heuristics[index])
+            order.insert(0, best_index)
+
+            depth_stats = DepthStats(
+                depth + 1,
+                self.nodes - iteration_start_nodes,
+                time.perf_counter() - iteration_start,
+                moves[best_index],
+                heuristics[best_index],
             )
+            self.stats.depths.append(depth_stats)
+            self.reporter.iteration(self.stats)
 
-            if heur > best_heuristic:
-                best_heuristic = heur
-                best_move = move
+            if self.deadline is not None and self.time_limit is not None:
+                # next iteration most likely takes longer than all previous ones
+                if time.monotonic() > self.deadline - self.time_limit / 2:
+                    break
+
+            if self.node_limit is not None and self.nodes >= self.node_limit:
+                break
+
+            if self.stop_requested:
+                break
+
+            self.stop_allowed = True
+            self.next_stop_check = self.nodes + 1
+
+        self.total_nodes += self.nodes
+
+        table = self.transposition_table
+        self.stats.nodes = self.nodes
+        self.stats.seconds = time.perf_counter() - start
+        self.stats.transposition_hits = table.hits
+        self.stats.transposition_misses = table.misses
+        self.stats.transposition_collisions = table.collisions
+        self.reporter.finish(self.stats)
+
+        return moves[best_index]
+
+    def search_root(
+        self, board: Board, moves: List[Move], order: List[int], depth: int
+    ) -> Tuple[List[int], int]:
+        """
+        Searches moves in given order. Returns heuristic per move and index of
+        best move. Only the heuristic of the best move is exact.
+        """
+        heuristics = len(moves) * [-INFINITE_HEURISTIC]
+        best_index = -1
+        self.max_extension_ply = MAX_EXTENSION_FACTOR * (depth + 1)
+
+        for index in order:
+            # Moves that come before the best move in the move generation order
+            # need an exact score when they are equally good, so they can win ties.
+            if best_index == -1:
+                alpha = -INFINITE_HEURISTIC
+            elif index < best_index:
+                alpha = heuristics[best_index] - 1
+            else:
+                alpha = heuristics[best_index]
+
+            board.make_move(moves[index])
+            heur = -self.negamax(board, depth, -INFINITE_HEURISTIC, -alpha)
+            board.unmake_move()
+
+            heuristics[index] = heur
+
+            if heur > alpha:
+                # heur is exact and better than or tied with the best move so far
+                best_index = index
+
+        return heuristics, best_index
+
+    def search_root_parallel(
+        self, board: Board, moves: List[Move], order: List[int], depth: int
+    ) -> Tuple[List[int], int]:
+        """
+        Like search_root(), but searches root moves in worker processes.
+
+        Workers share the best heuristic found so far, which they use as alpha.
+        Alpha is lowered by one, so every move that is at least as good as the
+        best move so far gets an exact heuristic. The result then does not
+        depend on the order in which workers finish. Workers also share the
+        number of searched nodes, so together they stay within the node limit.
+        """
+        if self.executor is None:
+            self.shared_best_heuristic = multiprocessing.Value("q")
+            self.shared_worker_nodes = multiprocessing.Value("q")
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=parallel.init_worker,
+                initargs=(self, self.shared_best_heuristic, self.shared_worker_nodes),
+            )
+
+        assert self.shared_best_heuristic is not None
+        assert self.shared_worker_nodes is not None
+        self.shared_best_heuristic.value = -INFINITE_HEURISTIC
+        self.shared_worker_nodes.value = 0
+
+        node_budget: Optional[int] = None
+        if self.stop_allowed and self.node_limit is not None:
+            node_budget = self.node_limit - self.nodes
+
+        deadline: Optional[float] = None
+        if self.stop_allowed:
+            deadline = self.deadline
+
+        def submit(index: int) -> "Future[Optional[Tuple[int, int]]]":
+            assert self.executor is not None
+            return self.executor.submit(
+                parallel.search_root_move,
+                board,
+                moves[index],
+                depth,
+                deadline,
+                node_budget,
+                self.game_position_keys,
+            )
+
+        # The first move is most likely the best, searching it before the other
+        # moves gives workers a good alpha from the start.
+        futures = {order[0]: submit(order[0])}
+        futures[order[0]].result()
+
+        for index in order[1:]:
+            futures[index] = submit(index)
+
+        heuristics = len(moves) * [-INFINITE_HEURISTIC]
+        best_index = -1
+        stopped = False
 
-        return best_move
+        for index in sorted(futures):
+            result = futures[index].result()
+
+            if result is None:
+                stopped = True
+                continue
+
+            heur, alpha = result
+            heuristics[index] = heur
+
+            # Only heuristics above alpha are exact. Indexes are increasing,
+            # so the first move with the best heuristic wins ties.
+            if heur > alpha and (best_index == -1 or heur > heuristics[best_index]):
+                best_index = index
+
+        # also counts nodes of moves of which the search was stopped
+        self.nodes += self.shared_worker_nodes.value
+
+        if stopped:
+            raise SearchStopped
+
+        return heuristics, best_index
+
+    def search_root_move(
+        self,
+        board: Board,
+        move: Move,
+        depth: int,
+        best_heuristic: "Synchronized[int]",
+        shared_nodes: "Synchronized[int]",
+        deadline: Optional[float],
+        node_budget: Optional[int],
+        game_position_keys: Set[int],
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Searches one root move in a worker process. Returns heuristic of move
+        and the alpha it was searched with, searched nodes are added to
+        shared_nodes. Returns None if the search was stopped.
+        """
+        self.nodes = 0
+        self.shared_nodes = shared_nodes
+        self.shared_nodes_added = 0
+        self.game_position_keys = game_position_keys
+        self.deadline = deadline
+        self.node_limit = node_budget
+        self.stop_allowed = deadline is not None or node_budget is not None
+
+        # other workers may have used up the node budget already
+        self.next_stop_check = 0
+
+        if best_heuristic.value == -INFINITE_HEURISTIC:
+            alpha = -INFINITE_HEURISTIC
+        else:
+            alpha = best_heuristic.value - 1
+
+        # forget killers and age history scores, like search() does
+        if self.move_ordering is not None:
+            self.move_ordering.start_search()
+
+        board.set_piece_square_table(self.piece_square_table)
+        self.set_bitbase_cutoffs(board)
+        self.root_history_length = len(board.history)
+        self.max_extension_ply = MAX_EXTENSION_FACTOR * (depth + 1)
+        board.make_move(move)
+
+        try:
+            heur = -self.negamax(board, depth, -INFINITE_HEURISTIC, -alpha)
+        except SearchStopped:
+            return None
+        finally:
+            self.count_shared_nodes()
+
+        if heur > alpha:
+            with best_heuristic.get_lock():
+                if heur > best_heuristic.value:
+                    best_heuristic.value = heur
+
+        return heur, alpha
+
+    def request_stop(self) -> None:
+        """
+        Makes search() return as soon as it has a move, can be called from
+        another thread. The caller should reset stop_requested before the next
+        search.
+        """
+        self.stop_requested = True
+
+    def check_stop(self) -> None:
+        """
+        Raises SearchStopped if the search ran out of time or nodes
+        """
+        self.next_stop_check = self.nodes + STOP_CHECK_INTERVAL
+
+        if not self.stop_allowed:
+            return
+
+        if self.stop_requested:
+            raise SearchStopped
+
+        if self.node_limit is not None:
+            nodes = self.count_shared_nodes()
+            if nodes >= self.node_limit:
+                raise SearchStopped
+
+            # Workers share what is left of the node limit. Other workers may
+            # have searched nodes they did not add yet, so leave room for those.
+            remaining_nodes = self.node_limit - nodes
+            if self.shared_nodes is not None:
+                remaining_nodes = max(remaining_nodes // (2 * self.workers), 1)
+            self.next_stop_check = min(
+                self.next_stop_check, self.nodes + remaining_nodes
+            )
+
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise SearchStopped
+
+    def count_shared_nodes(self) -> int:
+        """
+        Returns number of nodes searched so far. In a worker process, this adds
+        the new nodes to shared_nodes and returns the total of all workers.
+        """
+        if self.shared_nodes is None:
+            return self.nodes
+
+        with self.shared_nodes.get_lock():
+            self.shared_nodes.value += self.nodes - self.shared_nodes_added
+            total: int = self.shared_nodes.value
+
+        self.shared_nodes_added = self.nodes
+        return total
+
+    def negamax(self, board: Board, depth: int, alpha: int, beta: int) -> int:
+        """
+        Returns heuristic from the perspective of the player to move.
+        If the result is outside of the alpha-beta window, it is a bound.
+        """
+        repetition = board.key in self.game_position_keys
+
+        if depth == 0 and self.quiescence and not repetition:
+            # quiescence_search() counts this node and probes the bitbases
+            return self.quiescence_search(board, alpha, beta)
 
-    def minimax(self, board: Board, depth: int, is_max: bool) -> int:
         self.nodes += 1
 
+        if self.nodes >= self.next_stop_check:
+            self.check_stop()
+
+        if repetition:
+            # the opponent can repeat this position, so winning from here
+            # is no progress
+            return STALEMATE_HEURISTIC
+
+        bitbase_heuristic = self.probe_bitbases(board, depth == 0)
+        if bitbase_heuristic is not None:
+            return bitbase_heuristic
+
         if depth == 0:
-            return self.heuristic(board)
+            return self.evaluate(board)
+
+        original_alpha = alpha
+
+        table_heuristic, hash_move = self.probe_transposition_table(
+            board, depth, alpha, beta
+        )
+        if table_heuristic is not None:
+            self.stats.transposition_cutoffs += 1
+            return table_heuristic
 
-        moves = board.get_moves()
+        in_check = (
+            self.null_move_pruning or self.selective_search
+        ) and board.is_checked(board.turn)
+
+        if self.null_move_pruning:
+            null_move_heuristic = self.search_null_move(board, depth, beta, in_check)
+            if null_move_heuristic is not None:
+                return null_move_heuristic
+
+        moves = self.generate_moves(board)
 
         if not moves:
             if board.is_checked(board.turn):
-                if board.turn == self.color:
-                    return -CHECKMATE_HEURISTIC
-                return CHECKMATE_HEURISTIC
+                return -(CHECKMATE_HEURISTIC - self.get_ply(board))
+
+            return STALEMATE_HEURISTIC
+
+        moves = self.order_moves(board, moves, hash_move)
+
+        leaf_heuristics: Optional[List[int]] = None
+
+        if (
+            depth == 1
+            and self.batch_leaves
+            and not self.may_repeat_game_position(board)
+        ):
+            leaf_heuristics = self.evaluate_children(board, moves)
+
+        best_heuristic = -INFINITE_HEURISTIC
+        best_move: Optional[Move] = None
+
+        for index, move in enumerate(moves):
+            if leaf_heuristics is not None:
+                self.nodes += 1
+                heur = leaf_heuristics[index]
+            elif self.selective_search:
+                heur = self.search_selective(
+                    board, move, index, depth, alpha, beta, in_check
+                )
+            else:
+                board.make_move(move)
+                heur = -self.negamax(board, depth - 1, -beta, -alpha)
+                board.unmake_move()
+
+            if heur > best_heuristic:
+                best_heuristic = heur
+                best_move = move
+
+                if heur > alpha:
+                    alpha = heur
+
+                    if alpha >= beta:
+                        self.add_cutoff(board, move, index, depth)
+                        break
+
+        self.store_transposition_table(
+            board, depth, best_heuristic, original_alpha, beta, best_move
+        )
+        return best_heuristic
+
+    def search_null_move(
+        self, board: Board, depth: int, beta: int, in_check: bool
+    ) -> Optional[int]:
+        """
+        Returns heuristic of board if passing the turn already fails high, so
+        any real move most likely does too. Returns None if board should be
+        searched normally. With only pawns and a king, passing is often better
+        than any move (zugzwang), such boards are always searched.
+        """
+        if in_check or depth <= NULL_MOVE_REDUCTION:
+            return None
+
+        if abs(beta) >= BITBASE_WIN_HEURISTIC:
+            # a pass doesn't prove a mate or a bitbase win
+            return None
+
+        turn = board.turn
+        pieces = board.occupied[turn] & ~board.bitboards[PAWN_PIECE_TYPES[turn]]
+        if pieces & (pieces - 1) == 0:
+            # only the king is left besides pawns
+            return None
+
+        if board.history and board.history[-1][0] == NULL_MOVE:
+            # two passes in a row search the same board with less depth
+            return None
+
+        if self.evaluate(board) < beta:
+            return None
+
+        board.make_null_move()
+        heur = -self.negamax(board, depth - 1 - NULL_MOVE_REDUCTION, -beta, 1 - beta)
+        board.unmake_null_move()
+
+        if heur < beta:
+            return None
+
+        self.stats.null_move_cutoffs += 1
+
+        # below any mate or bitbase win, those need a real move to be proven
+        return min(heur, BITBASE_WIN_HEURISTIC - 1)
+
+    def search_selective(
+        self,
+        board: Board,
+        move: Move,
+        index: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+        in_check: bool,
+    ) -> int:
+        """
+        Returns heuristic of move, the index-th searched move of board, like
+        negamax() of the child. Checks can be extended and late quiet moves
+        reduced by one ply.
+        """
+        reducible = (
+            self.late_move_reductions
+            and depth >= LMR_MIN_DEPTH
+            and index >= LMR_FULL_DEPTH_MOVES
+            and not in_check
+            and is_quiet_move(board, move)
+        )
+
+        board.make_move(move)
+        child_depth = depth - 1
+
+        if self.check_extensions or reducible:
+            gives_check = board.is_checked(board.turn)
+
+            if self.check_extensions and gives_check:
+                if self.get_ply(board) < self.max_extension_ply:
+                    self.stats.check_extensions += 1
+                    child_depth = depth
+
+            if reducible and not gives_check:
+                self.stats.late_move_reductions += 1
+
+                # null window: we only need to know whether move beats alpha
+                heur = -self.negamax(board, child_depth - 1, -alpha - 1, -alpha)
+                if heur <= alpha:
+                    board.unmake_move()
+                    return heur
+
+                self.stats.late_move_researches += 1
+
+        heur = -self.negamax(board, child_depth, -beta, -alpha)
+        board.unmake_move()
+        return heur
+
+    def order_moves(
+        self, board: Board, moves: List[Move], hash_move: Optional[Move]
+    ) -> List[Move]:
+        """
+        Returns moves of board in the order in which negamax() searches them
+        """
+        if self.move_ordering is not None:
+            ply = self.get_ply(board)
+            return self.move_ordering.order_moves(board, moves, hash_move, ply)
+
+        if hash_move in moves:
+            # best move found by an earlier search is likely still good
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
 
+        return moves
+
+    def add_cutoff(self, board: Board, move: Move, index: int, depth: int) -> None:
+        """
+        Counts beta cutoff caused by move, the index-th searched move of board
+        """
+        self.stats.beta_cutoffs += 1
+        if index == 0:
+            self.stats.first_move_cutoffs += 1
+
+        if self.move_ordering is not None:
+            ply = self.get_ply(board)
+            self.move_ordering.add_cutoff(board, move, ply, depth)
+
+    def probe_transposition_table(
+        self, board: Board, depth: int, alpha: int, beta: int
+    ) -> Tuple[Optional[int], Optional[Move]]:
+        """
+        Returns heuristic if the stored result can be used as result of
+        negamax(), and the best move found earlier for board if any.
+        """
+        entry = self.transposition_table.lookup(board.key)
+        if not entry:
+            return None, None
+
+        entry_depth, entry_heuristic, entry_bound, hash_move = entry
+        entry_heuristic = self.mate_from_table(board, entry_heuristic)
+
+        # Results of deeper searches are not used, they would make results
+        # depend on which positions happen to be in the table.
+        if entry_depth == depth:
+            if entry_bound == Bound.EXACT:
+                return entry_heuristic, hash_move
+
+            if entry_bound == Bound.LOWER and entry_heuristic >= beta:
+                return entry_heuristic, hash_move
+
+            if entry_bound == Bound.UPPER and entry_heuristic <= alpha:
+                return entry_heuristic, hash_move
+
+        return None, hash_move
+
+    def store_transposition_table(
+        self,
+        board: Board,
+        depth: int,
+        heuristic: int,
+        alpha: int,
+        beta: int,
+        best_move: Optional[Move],
+    ) -> None:
+        """
+        Stores result of negamax() searched with window alpha, beta
+        """
+        if heuristic <= alpha:
+            bound = Bound.UPPER
+        elif heuristic >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+
+        heuristic = self.mate_to_table(board, heuristic)
+        self.transposition_table.store(board.key, depth, heuristic, bound, best_move)
+
+    def mate_to_table(self, board: Board, heuristic: int) -> int:
+        """
+        Returns heuristic with mates counted from board instead of from the
+        root, so stored mates are valid wherever board is found again
+        """
+        if heuristic >= MIN_CHECKMATE_HEURISTIC:
+            return heuristic + self.get_ply(board)
+        if heuristic <= -MIN_CHECKMATE_HEURISTIC:
+            return heuristic - self.get_ply(board)
+        return heuristic
+
+    def mate_from_table(self, board: Board, heuristic: int) -> int:
+        """
+        Reverts mate_to_table()
+        """
+        if heuristic >= MIN_CHECKMATE_HEURISTIC:
+            return heuristic - self.get_ply(board)
+        if heuristic <= -MIN_CHECKMATE_HEURISTIC:
+            return heuristic + self.get_ply(board)
+        return heuristic
+
+    def get_ply(self, board: Board) -> int:
+        """
+        Returns number of moves done on board since the root of the search
+        """
+        return len(board.history) - self.root_history_length
+
+    def may_repeat_game_position(self, board: Board) -> bool:
+        """
+        Returns whether a child of board can be in game_position_keys. After a
+        capture or pawn move in the search, earlier positions can't occur again.
+        """
+        if not self.game_position_keys:
+            return False
+
+        # the halfmove clock was reset if the search did such a move
+        return board.halfmove_clock >= self.get_ply(board)
+
+    def set_bitbase_cutoffs(self, board: Board) -> None:
+        """
+        Won and lost bitbase positions are not searched, unless the search starts
+        in one. Then they are only used as leaves, so the search still finds a
+        way towards mate.
+        """
+        self.bitbase_cutoffs = self.bitbases is None or self.bitbases.probe(board) in [
+            None,
+            BITBASE_DRAW,
+        ]
+
+    def probe_bitbases(self, board: Board, leaf: bool) -> Optional[int]:
+        """
+        Returns exact heuristic from the perspective of the player to move if
+        board is in a bitbase, None otherwise or if board should be searched
+        """
+        if self.bitbases is None:
+            return None
+
+        result = self.bitbases.probe(board)
+        if result is None:
+            return None
+
+        if result == BITBASE_DRAW:
+            self.stats.bitbase_hits += 1
             return STALEMATE_HEURISTIC
 
-        heurs: List[int] = []
+        if not leaf and not self.bitbase_cutoffs:
+            return None
+
+        self.stats.bitbase_hits += 1
+
+        if not board.has_legal_moves():
+            # the bitbase doesn't tell mates apart from other lost positions
+            return -(CHECKMATE_HEURISTIC - self.get_ply(board))
+
+        # prefer wins that make progress, so we don't shuffle around
+        heuristic = BITBASE_WIN_HEURISTIC + get_win_progress(board)
+
+        if result == BITBASE_WIN:
+            return heuristic
+        return -heuristic
+
+    def quiescence_search(self, board: Board, alpha: int, beta: int) -> int:
+        """
+        Like negamax(), but only searches captures and promotions. The player to
+        move can also choose to stop capturing and accept the heuristic.
+        """
+        self.nodes += 1
+        self.stats.quiescence_nodes += 1
+
+        if self.nodes >= self.next_stop_check:
+            self.check_stop()
+
+        bitbase_heuristic = self.probe_bitbases(board, True)
+        if bitbase_heuristic is not None:
+            return bitbase_heuristic
+
+        # stand pat
+        best_heuristic = self.evaluate(board)
+
+        if best_heuristic >= beta:
+            return best_heuristic
+
+        if best_heuristic > alpha:
+            alpha = best_heuristic
+
+        moves = self.generate_moves(board, captures_only=True)
+        moves.sort(key=lambda move: -get_mvv_lva_score(board, move))
 
         for move in moves:
-            heur = self.minimax(move, depth - 1, not is_max)
-            heurs.append(heur)
+            board.make_move(move)
+            heur = -self.quiescence_search(board, -beta, -alpha)
+            board.unmake_move()
+
+            if heur > best_heuristic:
+                best_heuristic = heur
+
+                if heur > alpha:
+                    alpha = heur
 
-        if is_max:
-            return max(heurs)
+                    if alpha >= beta:
+                        break
+
+        return best_heuristic
+
+    def generate_moves(self, board: Board, captures_only: bool = False) -> List[Move]:
+        """
+        Returns legal moves of board, measures time spent if enabled
+        """
+        if not self.measure_time:
+            return board.get_legal_moves(captures_only)
+
+        start = time.perf_counter()
+        moves = board.get_legal_moves(captures_only)
+        self.stats.move_generation_seconds += time.perf_counter() - start
+        return moves
+
+    def evaluate(self, board: Board) -> int:
+        """
+        Returns heuristic from the perspective of the player to move
+        """
+        if self.measure_time:
+            start = time.perf_counter()
+            heuristic = self.heuristic(board)
+            self.stats.evaluation_seconds += time.perf_counter() - start
         else:
-            return min(heurs)
+            heuristic = self.heuristic(board)
+
+        if board.turn == self.color:
+            return heuristic
+        return -heuristic
 
-    def search_speed(self) -> float:
-        elapsed_seconds = (datetime.now() - self.search_start).total_seconds()
-        return self.nodes / elapsed_seconds
+    def evaluate_children(self, board: Board, moves: List[Move]) -> List[int]:
+        """
+        Returns heuristic after each of moves, from the perspective of the player
+        to move on board, the same as negating negamax() with depth 0 of each
+        child. Children that repeat a game position are not checked, see
+        may_repeat_game_position(). Only works for bots with a piece_square_table.
+        """
+        if self.measure_time:
+            start = time.perf_counter()
+            scores = board.get_child_scores(moves)
+            self.stats.evaluation_seconds += time.perf_counter() - start
+        else:
+            scores = board.get_child_scores(moves)
+
+        if board.turn == Color.WHITE:
+            return scores
+        return [-score for score in scores]
 
     def heuristic(self, board: Board) -> int:
-        raise NotImplementedError
+        """
+        Returns heuristic from the perspective of this bot
+        """
+        if self.piece_square_table is None:
+            raise NotImplementedError
+
+        if self.color == Color.WHITE:
+            return board.score
+        return -board.score
+
+
+def get_history_keys(board: Board) -> Set[int]:
+    """
+    Returns Zobrist hashes of positions before each move in the history of
+    board, since the last capture or pawn move
+    """
+    # earlier positions can't occur again
+    start = max(len(board.history) - board.halfmove_clock, 0)
+    return {item[5] for item in board.history[start:]}
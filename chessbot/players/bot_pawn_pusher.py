@@ -1,25 +1,13 @@
-from chessbot.board import Board
-from chessbot.enums import Color, PieceType
+from chessbot.enums import PieceType
+from chessbot.evaluation import new_piece_square_table
 from chessbot.players.base import BaseBot
 
+# pawns are worth more the closer they are to promotion
+PAWN_PUSHER_PIECE_SQUARE_TABLE = new_piece_square_table(
+    {PieceType.WHITE_QUEEN: 9},
+    {PieceType.WHITE_PAWN: [6 - square // 8 for square in range(64)]},
+)
 
-class PawnPusherBot(BaseBot):
-    def heuristic(self, board: Board) -> int:
-        total = 0
-
-        for square_id, field in enumerate(board.fields):
-            y = square_id // 8
-
-            if field == PieceType.BLACK_PAWN:
-                total -= y - 1
-            elif field == PieceType.WHITE_PAWN:
-                total += 6 - y
-            elif field == PieceType.BLACK_QUEEN:
-                total -= 9
-            elif field == PieceType.WHITE_QUEEN:
-                total += 9
 
-        if self.color == Color.BLACK:
-            total *= -1
-
-        return total
+class PawnPusherBot(BaseBot):
+    piece_square_table = PAWN_PUSHER_PIECE_SQUARE_TABLE
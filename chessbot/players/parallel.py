@@ -0,0 +1,57 @@
+"""
+Functions that run in worker processes of BaseBot.search_root_parallel()
+"""
+
+from multiprocessing.sharedctypes import Synchronized
+from typing import TYPE_CHECKING, Optional, Set, Tuple
+
+from chessbot.board import Board
+from chessbot.move import Move
+
+if TYPE_CHECKING:
+    from chessbot.players.base import BaseBot
+
+
+# set by init_worker() in every worker process
+_worker_bot: Optional["BaseBot"] = None
+_best_heuristic: Optional["Synchronized[int]"] = None
+_shared_nodes: Optional["Synchronized[int]"] = None
+
+
+def init_worker(
+    bot: "BaseBot",
+    best_heuristic: "Synchronized[int]",
+    shared_nodes: "Synchronized[int]",
+) -> None:
+    global _worker_bot, _best_heuristic, _shared_nodes
+    _worker_bot = bot
+    _best_heuristic = best_heuristic
+    _shared_nodes = shared_nodes
+
+
+def search_root_move(
+    board: Board,
+    move: Move,
+    depth: int,
+    deadline: Optional[float],
+    node_budget: Optional[int],
+    game_position_keys: Set[int],
+) -> Optional[Tuple[int, int]]:
+    """
+    Returns heuristic of move and the alpha it was searched with. Returns None
+    if the search was stopped.
+    """
+    assert _worker_bot is not None
+    assert _best_heuristic is not None
+    assert _shared_nodes is not None
+
+    return _worker_bot.search_root_move(
+        board,
+        move,
+        depth,
+        _best_heuristic,
+        _shared_nodes,
+        deadline,
+        node_budget,
+        game_position_keys,
+    )
@@ -6,5 +6,8 @@ from chessbot.players.base import BasePlayer
 
 class RandomPlayer(BasePlayer):
     def do_move(self, board: Board) -> Board:
-        moves = board.get_moves()
-        return random.choice(moves)
+        move = random.choice(board.get_legal_moves())
+
+        child = board.copy()
+        child.make_move(move)
+        return child
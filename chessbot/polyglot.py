@@ -0,0 +1,195 @@
+import mmap
+import os
+import random
+import struct
+from typing import List, Optional, Tuple
+
+from chessbot.bitboard import iter_squares
+from chessbot.board import Board
+from chessbot.constants import (
+    CASTLING_SQUARES,
+    COLOR_PIECE_TYPES,
+    KING_PIECE_TYPES,
+)
+from chessbot.enums import Castling, Color, PieceType
+from chessbot.move import Move
+from chessbot.polyglot_random import POLYGLOT_RANDOM_ARRAY
+
+# Format of book entries: key, move, weight and learn value, big-endian
+# Source: http://hgm.nubati.net/book_format.html
+POLYGLOT_ENTRY = struct.Struct(">QHHI")
+
+POLYGLOT_KEY = struct.Struct(">Q")
+
+# index of PieceType in the Polyglot random array, divided by 64
+POLYGLOT_PIECE_KINDS = {
+    PieceType.BLACK_PAWN: 0,
+    PieceType.WHITE_PAWN: 1,
+    PieceType.BLACK_KNIGHT: 2,
+    PieceType.WHITE_KNIGHT: 3,
+    PieceType.BLACK_BISHOP: 4,
+    PieceType.WHITE_BISHOP: 5,
+    PieceType.BLACK_ROOK: 6,
+    PieceType.WHITE_ROOK: 7,
+    PieceType.BLACK_QUEEN: 8,
+    PieceType.WHITE_QUEEN: 9,
+    PieceType.BLACK_KING: 10,
+    PieceType.WHITE_KING: 11,
+}
+
+POLYGLOT_CASTLING_OFFSET = 768
+POLYGLOT_EN_PASSENT_OFFSET = 772
+POLYGLOT_WHITE_TO_MOVE_OFFSET = 780
+
+# promoted piece in Polyglot moves: knight, bishop, rook, queen
+POLYGLOT_PROMOTIONS = [
+    [
+        PieceType.BLACK_KNIGHT,
+        PieceType.BLACK_BISHOP,
+        PieceType.BLACK_ROOK,
+        PieceType.BLACK_QUEEN,
+    ],
+    [
+        PieceType.WHITE_KNIGHT,
+        PieceType.WHITE_BISHOP,
+        PieceType.WHITE_ROOK,
+        PieceType.WHITE_QUEEN,
+    ],
+]
+
+
+def get_polyglot_square(square: int) -> int:
+    """
+    Converts between our squares (a8 is 0) and Polyglot squares (a1 is 0)
+    """
+    return square ^ 56
+
+
+def get_polyglot_key(board: Board) -> int:
+    """
+    Returns hash of board as used by Polyglot opening books
+    """
+    key = 0
+
+    for color_piece_types in COLOR_PIECE_TYPES:
+        for piece_type in color_piece_types:
+            offset = 64 * POLYGLOT_PIECE_KINDS[piece_type]
+            for square in iter_squares(board.bitboards[piece_type]):
+                key ^= POLYGLOT_RANDOM_ARRAY[offset + get_polyglot_square(square)]
+
+    for castling in Castling:
+        if board.castling[castling]:
+            key ^= POLYGLOT_RANDOM_ARRAY[POLYGLOT_CASTLING_OFFSET + castling]
+
+    # Only hashed if a pawn can capture, even if that would be illegal.
+    if board.en_passent_column is not None and board.can_capture_en_passent():
+        key ^= POLYGLOT_RANDOM_ARRAY[
+            POLYGLOT_EN_PASSENT_OFFSET + board.en_passent_column
+        ]
+
+    if board.turn == Color.WHITE:
+        key ^= POLYGLOT_RANDOM_ARRAY[POLYGLOT_WHITE_TO_MOVE_OFFSET]
+
+    return key
+
+
+def decode_polyglot_move(board: Board, polyglot_move: int) -> Optional[Move]:
+    """
+    Returns legal move on board for move from a Polyglot book, None if there
+    is no such move
+    """
+    to = get_polyglot_square(polyglot_move & 63)
+    from_ = get_polyglot_square((polyglot_move >> 6) & 63)
+    promotion_index = (polyglot_move >> 12) & 7
+
+    promotion = PieceType.EMPTY
+    if promotion_index:
+        promotion = POLYGLOT_PROMOTIONS[board.turn][promotion_index - 1]
+
+    # Polyglot encodes castling as the king capturing its own rook.
+    if board.get_piece_type(from_) == KING_PIECE_TYPES[board.turn]:
+        for king_from, king_to, rook_from, _ in CASTLING_SQUARES:
+            if (from_, to) == (king_from, rook_from):
+                to = king_to
+
+    for move in board.get_legal_moves():
+        if move.from_ == from_ and move.to == to and move.promotion == promotion:
+            return move
+
+    return None
+
+
+class OpeningBook:
+    def __init__(self, path: str, seed: Optional[int] = None) -> None:
+        """
+        Opens Polyglot book. Moves are chosen randomly by weight, seed makes
+        that repeatable.
+        """
+        self.path = path
+        self.random = random.Random(seed)
+        self.file = open(path, "rb")
+        self.entry_count = os.path.getsize(path) // POLYGLOT_ENTRY.size
+
+        # mmap can't map empty files
+        self.data: Optional[mmap.mmap] = None
+        if self.entry_count:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        if self.data is not None:
+            self.data.close()
+        self.file.close()
+
+    def get_key(self, index: int) -> int:
+        assert self.data is not None
+        key: int = POLYGLOT_KEY.unpack_from(self.data, index * POLYGLOT_ENTRY.size)[0]
+        return key
+
+    def get_entries(self, board: Board) -> List[Tuple[Move, int]]:
+        """
+        Returns legal book moves for board with their weights
+        """
+        if self.data is None:
+            return []
+
+        key = get_polyglot_key(board)
+
+        # binary search for first entry with key, entries are sorted by key
+        low = 0
+        high = self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        entries: List[Tuple[Move, int]] = []
+
+        for index in range(low, self.entry_count):
+            entry_key, polyglot_move, weight, _ = POLYGLOT_ENTRY.unpack_from(
+                self.data, index * POLYGLOT_ENTRY.size
+            )
+
+            if entry_key != key:
+                break
+
+            move = decode_polyglot_move(board, polyglot_move)
+            if move is not None:
+                entries.append((move, weight))
+
+        return entries
+
+    def choose_move(self, board: Board) -> Optional[Move]:
+        """
+        Returns random book move for board, moves with higher weight are more
+        likely. Returns None if board is not in the book.
+        """
+        entries = [(move, weight) for move, weight in self.get_entries(board) if weight]
+
+        if not entries:
+            return None
+
+        moves = [move for move, _ in entries]
+        weights = [weight for _, weight in entries]
+        return self.random.choices(moves, weights)[0]
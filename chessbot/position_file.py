@@ -0,0 +1,113 @@
+import mmap
+import os
+from typing import Iterator, List, Optional
+
+from chessbot.board import PACKED_BOARD, Board
+
+# Position files are a sequence of boards packed by Board.to_bytes(), without
+# header, so they can be concatenated and indexed directly.
+POSITION_SIZE_BYTES = PACKED_BOARD.size
+
+# number of boards buffered by PositionWriter before writing them
+WRITE_BUFFER_POSITIONS = 4096
+
+
+class PositionWriter:
+    def __init__(self, path: str, append: bool = False) -> None:
+        """
+        Writes boards to position file at path, which is overwritten unless
+        append is set
+        """
+        if append:
+            self.file = open(path, "ab")
+        else:
+            self.file = open(path, "wb")
+
+        self.buffer: List[bytes] = []
+        self.count = 0
+
+    def __enter__(self) -> "PositionWriter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def write(self, board: Board) -> None:
+        self.buffer.append(board.to_bytes())
+        self.count += 1
+
+        if len(self.buffer) >= WRITE_BUFFER_POSITIONS:
+            self.flush()
+
+    def flush(self) -> None:
+        self.file.write(b"".join(self.buffer))
+        self.buffer = []
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+
+        self.flush()
+        self.file.close()
+
+
+class PositionReader:
+    def __init__(self, path: str) -> None:
+        """
+        Reads boards from position file at path. The file is mapped into
+        memory, boards are only unpacked when they are accessed.
+        """
+        size = os.path.getsize(path)
+        if size % POSITION_SIZE_BYTES != 0:
+            raise ValueError(
+                f"size of {path} is not a multiple of {POSITION_SIZE_BYTES} bytes"
+            )
+
+        self.count = size // POSITION_SIZE_BYTES
+        self.file = open(path, "rb")
+
+        # mmap can't map empty files
+        self.data: Optional[mmap.mmap] = None
+        if self.count:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> "PositionReader":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Board:
+        if index < 0:
+            index += self.count
+
+        if not 0 <= index < self.count:
+            raise IndexError("position index out of range")
+
+        assert self.data is not None
+        return Board.from_bytes(self.data, index * POSITION_SIZE_BYTES)
+
+    def __iter__(self) -> Iterator[Board]:
+        return self.iter_boards()
+
+    def iter_boards(self, start: int = 0) -> Iterator[Board]:
+        """
+        Yields boards in file order, starting at index start
+        """
+        if self.data is None:
+            return
+
+        for offset in range(
+            start * POSITION_SIZE_BYTES, len(self.data), POSITION_SIZE_BYTES
+        ):
+            yield Board.from_bytes(self.data, offset)
+
+    def close(self) -> None:
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        self.file.close()
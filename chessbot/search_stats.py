@@ -0,0 +1,218 @@
+import json
+from typing import Any, Dict, List, Optional, TextIO
+
+from chessbot.move import Move
+
+
+class DepthStats:
+    def __init__(
+        self, depth: int, nodes: int, seconds: float, best_move: Move, heuristic: int
+    ) -> None:
+        """
+        Result of one finished iteration of iterative deepening
+        """
+        self.depth = depth
+        self.nodes = nodes
+        self.seconds = seconds
+        self.best_move = best_move
+        self.heuristic = heuristic
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "nodes": self.nodes,
+            "seconds": round(self.seconds, 6),
+            "best_move": self.best_move.to_uci(),
+            "heuristic": self.heuristic,
+        }
+
+
+class SearchStats:
+    def __init__(self, bot_name: str) -> None:
+        """
+        Counters of one search. Times spent in move generation and evaluation
+        are only measured by bots created with measure_time.
+        """
+        self.bot_name = bot_name
+        self.depths: List[DepthStats] = []
+        self.book_move: Optional[Move] = None
+        self.seconds = 0.0
+
+        self.nodes = 0
+        self.quiescence_nodes = 0
+
+        self.transposition_hits = 0
+        self.transposition_misses = 0
+        self.transposition_collisions = 0
+        self.transposition_cutoffs = 0
+        self.bitbase_hits = 0
+
+        # beta cutoffs, and how many of them happened on the first move
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+
+        # selective search, only used by bots that enable it
+        self.null_move_cutoffs = 0
+        self.late_move_reductions = 0
+        self.late_move_researches = 0
+        self.check_extensions = 0
+
+        # Legality is checked while generating moves, so it is part of the
+        # move generation time.
+        self.move_generation_seconds = 0.0
+        self.evaluation_seconds = 0.0
+
+    @property
+    def best_move(self) -> Optional[Move]:
+        if self.book_move is not None:
+            return self.book_move
+        if not self.depths:
+            return None
+        return self.depths[-1].best_move
+
+    @property
+    def best_heuristic(self) -> Optional[int]:
+        if self.book_move is not None or not self.depths:
+            return None
+        return self.depths[-1].heuristic
+
+    @property
+    def finished_depth(self) -> int:
+        if not self.depths:
+            return 0
+        return self.depths[-1].depth
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / max(self.seconds, 1e-9)
+
+    def get_effective_branching_factor(self) -> Optional[float]:
+        """
+        Returns how many times more nodes the last iteration needed than the
+        one before, None if there are less than two iterations
+        """
+        if len(self.depths) < 2 or self.depths[-2].nodes == 0:
+            return None
+        return self.depths[-1].nodes / self.depths[-2].nodes
+
+    def to_dict(self) -> Dict[str, Any]:
+        best_move = self.best_move
+        if best_move is None:
+            best_move_uci = None
+        else:
+            best_move_uci = best_move.to_uci()
+
+        return {
+            "bot": self.bot_name,
+            "best_move": best_move_uci,
+            "book_move": self.book_move is not None,
+            "heuristic": self.best_heuristic,
+            "depth": self.finished_depth,
+            "seconds": round(self.seconds, 6),
+            "nodes": self.nodes,
+            "quiescence_nodes": self.quiescence_nodes,
+            "nodes_per_second": round(self.nodes_per_second),
+            "effective_branching_factor": self.get_effective_branching_factor(),
+            "transposition_hits": self.transposition_hits,
+            "transposition_misses": self.transposition_misses,
+            "transposition_collisions": self.transposition_collisions,
+            "transposition_cutoffs": self.transposition_cutoffs,
+            "bitbase_hits": self.bitbase_hits,
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "null_move_cutoffs": self.null_move_cutoffs,
+            "late_move_reductions": self.late_move_reductions,
+            "late_move_researches": self.late_move_researches,
+            "check_extensions": self.check_extensions,
+            "move_generation_seconds": round(self.move_generation_seconds, 6),
+            "evaluation_seconds": round(self.evaluation_seconds, 6),
+            "depths": [depth_stats.to_dict() for depth_stats in self.depths],
+        }
+
+
+class SearchReporter:
+    """
+    Gets called at the start, after every iteration and at the end of a search
+    """
+
+    def start(self, stats: SearchStats) -> None:
+        pass
+
+    def iteration(self, stats: SearchStats) -> None:
+        pass
+
+    def finish(self, stats: SearchStats) -> None:
+        pass
+
+
+class SilentReporter(SearchReporter):
+    """
+    Reports nothing
+    """
+
+
+class HumanReporter(SearchReporter):
+    def __init__(self, output: Optional[TextIO] = None) -> None:
+        """
+        Prints a line per iteration and a summary per search to output, or
+        stdout if output is None
+        """
+        self.output = output
+
+    def start(self, stats: SearchStats) -> None:
+        print(f"{stats.bot_name} is thinking:", file=self.output)
+
+    def iteration(self, stats: SearchStats) -> None:
+        depth_stats = stats.depths[-1]
+        nodes_per_second = depth_stats.nodes / max(depth_stats.seconds, 1e-9)
+
+        print(
+            f"depth {depth_stats.depth:>2} | best = {depth_stats.best_move.to_uci():<5}"
+            + f" | heur = {depth_stats.heuristic:>4}"
+            + f" | {depth_stats.nodes:>8} nodes | {nodes_per_second:7.0f} nodes/sec",
+            file=self.output,
+        )
+
+    def finish(self, stats: SearchStats) -> None:
+        if stats.book_move is not None:
+            print(
+                f"{stats.bot_name} plays book move {stats.book_move.to_uci()}",
+                file=self.output,
+            )
+            return
+
+        branching_factor = stats.get_effective_branching_factor()
+        if branching_factor is None:
+            branching_factor_text = "-"
+        else:
+            branching_factor_text = f"{branching_factor:.1f}"
+
+        summary = (
+            f"{stats.nodes} nodes in {stats.seconds:.2f} sec"
+            + f" | EBF = {branching_factor_text}"
+            + f" | TT hits = {stats.transposition_hits}"
+            + f", misses = {stats.transposition_misses}"
+            + f", collisions = {stats.transposition_collisions}"
+            + f", cutoffs = {stats.transposition_cutoffs}"
+            + f" | beta cutoffs = {stats.beta_cutoffs}"
+            + f", on first move = {stats.first_move_cutoffs}"
+        )
+
+        if stats.move_generation_seconds or stats.evaluation_seconds:
+            summary += (
+                f" | move generation = {stats.move_generation_seconds:.2f} sec"
+                + f", evaluation = {stats.evaluation_seconds:.2f} sec"
+            )
+
+        print(summary, file=self.output)
+
+
+class JsonReporter(SearchReporter):
+    def __init__(self, output: Optional[TextIO] = None) -> None:
+        """
+        Prints one line of JSON per search to output, or stdout if output is None
+        """
+        self.output = output
+
+    def finish(self, stats: SearchStats) -> None:
+        print(json.dumps(stats.to_dict()), file=self.output, flush=True)
@@ -0,0 +1,357 @@
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from chessbot.board import Board
+from chessbot.enums import Color, GameState
+from chessbot.game import Game
+from chessbot.move import Move
+from chessbot.pgn import format_pgn
+from chessbot.players.base import BaseBot, BasePlayer
+from chessbot.players.bot_material import MaterialBot
+from chessbot.players.bot_pawn_pusher import PawnPusherBot
+from chessbot.players.random import RandomPlayer
+from chessbot.search_stats import SearchReporter, SilentReporter
+
+BOT_CLASSES: Dict[str, Type[BaseBot]] = {
+    "material": MaterialBot,
+    "pawn_pusher": PawnPusherBot,
+}
+
+# BaseBot arguments that can be enabled in a bot config
+BOT_OPTIONS = [
+    "quiescence",
+    "killers",
+    "history",
+    "null_move",
+    "lmr",
+    "check_extensions",
+]
+
+
+class BotConfig:
+    def __init__(self, spec: str) -> None:
+        """
+        Parses spec such as "material:3" or "material:3:quiescence": bot name
+        from BOT_CLASSES, search depth and options. "random" plays random moves.
+        """
+        self.spec = spec
+        name, *rest = spec.split(":")
+
+        if name == "random":
+            if rest:
+                raise ValueError(f"random bot takes no depth or options: {spec}")
+
+            self.bot_class: Optional[Type[BaseBot]] = None
+            self.depth = 0
+            self.options: List[str] = []
+            return
+
+        if name not in BOT_CLASSES:
+            raise ValueError(
+                f"unknown bot {name}, choose from: {', '.join(BOT_CLASSES)}"
+            )
+
+        if not rest:
+            raise ValueError(f"missing depth in bot config: {spec}")
+
+        self.bot_class = BOT_CLASSES[name]
+        self.depth = int(rest[0])
+        self.options = rest[1:]
+
+        for option in self.options:
+            if option not in BOT_OPTIONS:
+                raise ValueError(
+                    f"unknown option {option}, choose from: {', '.join(BOT_OPTIONS)}"
+                )
+
+    def create(
+        self,
+        color: Color,
+        time_limit: Optional[float],
+        node_limit: Optional[int],
+        opening_book: Optional[str],
+        bitbases: Optional[str],
+        reporter: Optional[SearchReporter] = None,
+        measure_time: bool = False,
+    ) -> BasePlayer:
+        if self.bot_class is None:
+            return RandomPlayer(color)
+
+        return self.bot_class(
+            color,
+            self.depth,
+            time_limit=time_limit,
+            node_limit=node_limit,
+            quiescence="quiescence" in self.options,
+            killer_moves="killers" in self.options,
+            history_heuristic="history" in self.options,
+            null_move_pruning="null_move" in self.options,
+            late_move_reductions="lmr" in self.options,
+            check_extensions="check_extensions" in self.options,
+            opening_book=opening_book,
+            bitbases=bitbases,
+            reporter=reporter,
+            measure_time=measure_time,
+        )
+
+
+class GameTask:
+    def __init__(
+        self,
+        round_number: int,
+        white: BotConfig,
+        black: BotConfig,
+        opening: str,
+        max_plies: int,
+        time_limit: Optional[float],
+        node_limit: Optional[int],
+        opening_book: Optional[str],
+        bitbases: Optional[str],
+    ) -> None:
+        self.round_number = round_number
+        self.white = white
+        self.black = black
+        self.opening = opening
+        self.max_plies = max_plies
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.opening_book = opening_book
+        self.bitbases = bitbases
+
+
+class GameResult:
+    def __init__(
+        self,
+        task: GameTask,
+        moves: List[Move],
+        game_state: GameState,
+        winner: Optional[Color],
+        nodes: List[int],
+        seconds: float,
+    ) -> None:
+        self.task = task
+        self.moves = moves
+        self.game_state = game_state
+        self.winner = winner
+        self.nodes = nodes  # indexed by Color
+        self.seconds = seconds
+
+    def get_pgn_result(self) -> str:
+        if self.winner == Color.WHITE:
+            return "1-0"
+        if self.winner == Color.BLACK:
+            return "0-1"
+        return "1/2-1/2"
+
+    def to_pgn(self, event: str) -> str:
+        tags = {
+            "Event": event,
+            "Site": "?",
+            "Date": date.today().strftime("%Y.%m.%d"),
+            "Round": str(self.task.round_number),
+            "White": self.task.white.spec,
+            "Black": self.task.black.spec,
+            "Termination": self.game_state.name.lower(),
+            "PlyCount": str(len(self.moves)),
+        }
+        return format_pgn(tags, self.task.opening, self.moves, self.get_pgn_result())
+
+
+def play_game(task: GameTask) -> GameResult:
+    """
+    Plays one game without printing anything, runs in worker processes
+    """
+    white = task.white.create(
+        Color.WHITE,
+        task.time_limit,
+        task.node_limit,
+        task.opening_book,
+        task.bitbases,
+        SilentReporter(),
+    )
+    black = task.black.create(
+        Color.BLACK,
+        task.time_limit,
+        task.node_limit,
+        task.opening_book,
+        task.bitbases,
+        SilentReporter(),
+    )
+
+    game = Game(
+        black=black,
+        white=white,
+        board=Board.from_fen(task.opening),
+        show=False,
+        max_plies=task.max_plies,
+    )
+
+    start = time.perf_counter()
+    game_state, winner = game.play()
+
+    seconds = time.perf_counter() - start
+
+    nodes = [0, 0]
+    for color, player in [(Color.BLACK, black), (Color.WHITE, white)]:
+        if isinstance(player, BaseBot):
+            nodes[color] = player.total_nodes
+            player.close()
+
+    return GameResult(task, game.moves, game_state, winner, nodes, seconds)
+
+
+def get_pairings(
+    configs: List[BotConfig], gauntlet: bool
+) -> List[Tuple[BotConfig, BotConfig]]:
+    """
+    Returns pairs of bots that play each other. In a gauntlet, the first bot
+    plays all others. Otherwise every bot plays every other bot.
+    """
+    if gauntlet:
+        return [(configs[0], opponent) for opponent in configs[1:]]
+
+    return [
+        (first, second)
+        for index, first in enumerate(configs)
+        for second in configs[index + 1 :]
+    ]
+
+
+def get_tasks(
+    configs: List[BotConfig],
+    openings: List[str],
+    gauntlet: bool,
+    max_plies: int,
+    time_limit: Optional[float],
+    node_limit: Optional[int],
+    opening_book: Optional[str],
+    bitbases: Optional[str],
+) -> List[GameTask]:
+    """
+    Returns games to play: every pairing plays every opening with both colors
+    """
+    tasks: List[GameTask] = []
+
+    for first, second in get_pairings(configs, gauntlet):
+        for opening in openings:
+            for white, black in [(first, second), (second, first)]:
+                task = GameTask(
+                    len(tasks) + 1,
+                    white,
+                    black,
+                    opening,
+                    max_plies,
+                    time_limit,
+                    node_limit,
+                    opening_book,
+                    bitbases,
+                )
+                tasks.append(task)
+
+    return tasks
+
+
+def play_games(tasks: List[GameTask], workers: int) -> Iterator[GameResult]:
+    """
+    Plays games in worker processes, yields results in order of tasks
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(play_game, tasks)
+
+
+class Standing:
+    def __init__(self, spec: str) -> None:
+        self.spec = spec
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.nodes = 0
+        self.seconds = 0.0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        return self.wins + self.draws / 2
+
+    def get_elo(self) -> Optional[float]:
+        """
+        Returns Elo difference with the average opponent, estimated from score.
+        Returns None if all games were won or all were lost.
+        """
+        if self.games == 0:
+            return None
+
+        fraction = self.score / self.games
+        if fraction in [0.0, 1.0]:
+            return None
+
+        return -400 * math.log10(1 / fraction - 1)
+
+
+class Standings:
+    def __init__(self, configs: List[BotConfig]) -> None:
+        self.standings = {config.spec: Standing(config.spec) for config in configs}
+        self.games = 0
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+
+        for color, config in [
+            (Color.WHITE, result.task.white),
+            (Color.BLACK, result.task.black),
+        ]:
+            standing = self.standings[config.spec]
+            standing.nodes += result.nodes[color]
+
+            # both bots share the wall clock time of the game
+            standing.seconds += result.seconds / 2
+
+            if result.winner == color:
+                standing.wins += 1
+            elif result.winner is None:
+                standing.draws += 1
+            else:
+                standing.losses += 1
+
+    def format(self, seconds: float) -> str:
+        """
+        Returns table with results per bot, best score first
+        """
+        lines = [
+            f"{'bot':<30} | {'games':>5} | {'score':>7} | {'+/=/-':>13}"
+            + f" | {'elo':>6} | {'nodes/sec':>9}"
+        ]
+
+        standings = sorted(
+            self.standings.values(),
+            key=lambda standing: -standing.score / max(standing.games, 1),
+        )
+
+        for standing in standings:
+            elo = standing.get_elo()
+            if elo is None:
+                elo_text = "-"
+            else:
+                elo_text = f"{elo:+.0f}"
+
+            results = f"{standing.wins}/{standing.draws}/{standing.losses}"
+            speed = standing.nodes / max(standing.seconds, 1e-9)
+
+            lines.append(
+                f"{standing.spec:<30} | {standing.games:>5} | {standing.score:>7.1f}"
+                + f" | {results:>13} | {elo_text:>6} | {speed:>9.0f}"
+            )
+
+        games_per_minute = 60 * self.games / max(seconds, 1e-9)
+        lines.append(
+            f"{self.games} games in {seconds:.1f} sec"
+            + f" | {games_per_minute:.1f} games/minute"
+        )
+
+        return "\n".join(lines)
@@ -0,0 +1,109 @@
+from array import array
+from typing import Optional, Tuple
+
+from chessbot.enums import Bound
+from chessbot.move import Move
+
+# Every entry takes two 8 byte ints: the Board.key and the packed entry data.
+ENTRY_SIZE_BYTES = 16
+
+# Every bucket has one depth-preferred entry and one always-replace entry.
+ENTRIES_PER_BUCKET = 2
+
+# Layout of packed entry data:
+# - bits 0-17: best Move, 0 if unknown
+# - bits 18-19: Bound
+# - bits 20-27: depth + 1, so a used entry is never 0
+# - bits 28-63: heuristic + HEURISTIC_OFFSET
+MOVE_MASK = (1 << 18) - 1
+BOUND_SHIFT = 18
+DEPTH_SHIFT = 20
+HEURISTIC_SHIFT = 28
+HEURISTIC_OFFSET = 1 << 31
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: int) -> None:
+        assert size_mb > 0
+
+        max_buckets = (size_mb * 1024 * 1024) // (ENTRY_SIZE_BYTES * ENTRIES_PER_BUCKET)
+
+        # use a power of two, so we can find the bucket with a bitmask
+        bucket_count = 1 << (max_buckets.bit_length() - 1)
+
+        self.bucket_mask = bucket_count - 1
+        self.keys = array("Q", bytes(8 * ENTRIES_PER_BUCKET * bucket_count))
+        self.data = array("Q", bytes(8 * ENTRIES_PER_BUCKET * bucket_count))
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def clear(self) -> None:
+        entry_count = len(self.keys)
+        self.keys = array("Q", bytes(8 * entry_count))
+        self.data = array("Q", bytes(8 * entry_count))
+        self.reset_counters()
+
+    def lookup(self, key: int) -> Optional[Tuple[int, int, Bound, Optional[Move]]]:
+        """
+        Returns depth, heuristic, bound and best move stored for key, if any
+        """
+        index = (key & self.bucket_mask) * ENTRIES_PER_BUCKET
+
+        for entry_index in [index, index + 1]:
+            if self.keys[entry_index] == key and self.data[entry_index]:
+                self.hits += 1
+                data = self.data[entry_index]
+
+                move: Optional[Move] = None
+                if data & MOVE_MASK:
+                    move = Move(data & MOVE_MASK)
+
+                return (
+                    ((data >> DEPTH_SHIFT) & 0xFF) - 1,
+                    (data >> HEURISTIC_SHIFT) - HEURISTIC_OFFSET,
+                    Bound((data >> BOUND_SHIFT) & 3),
+                    move,
+                )
+
+        self.misses += 1
+
+        if self.data[index] or self.data[index + 1]:
+            # bucket is used by other positions
+            self.collisions += 1
+
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        heuristic: int,
+        bound: Bound,
+        move: Optional[Move],
+    ) -> None:
+        index = (key & self.bucket_mask) * ENTRIES_PER_BUCKET
+
+        data = (
+            (move or 0)
+            | (bound << BOUND_SHIFT)
+            | ((depth + 1) << DEPTH_SHIFT)
+            | ((heuristic + HEURISTIC_OFFSET) << HEURISTIC_SHIFT)
+        )
+
+        stored_depth = ((self.data[index] >> DEPTH_SHIFT) & 0xFF) - 1
+
+        # Deeper searches are more expensive to redo, so they stay in the
+        # depth-preferred entry. Everything else goes in the always-replace entry.
+        if self.keys[index] == key or depth >= stored_depth:
+            self.keys[index] = key
+            self.data[index] = data
+        else:
+            self.keys[index + 1] = key
+            self.data[index + 1] = data
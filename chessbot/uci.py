@@ -0,0 +1,346 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, TextIO
+
+from chessbot.board import Board
+from chessbot.enums import Color
+from chessbot.move import Move
+from chessbot.players.base import (
+    CHECKMATE_HEURISTIC,
+    MIN_CHECKMATE_HEURISTIC,
+    BaseBot,
+)
+from chessbot.search_stats import SearchStats, SilentReporter
+from chessbot.tournament import BotConfig
+from chessbot.transposition_table import TranspositionTable
+
+ENGINE_NAME = "chessbot"
+ENGINE_AUTHOR = "Luuk Verweij"
+
+# depth for searches that are only limited by time, nodes or the stop command
+MAX_SEARCH_DEPTH = 64
+
+# assumed number of moves left in the game, if the GUI doesn't tell us
+DEFAULT_MOVES_TO_GO = 30
+
+# seconds between checks for new search results and between info lines
+# without new results
+INFO_POLL_SECONDS = 0.05
+INFO_INTERVAL_SECONDS = 1.0
+
+# arguments of the go command that are followed by a number
+GO_LIMITS = [
+    "depth",
+    "movetime",
+    "wtime",
+    "btime",
+    "winc",
+    "binc",
+    "movestogo",
+    "nodes",
+]
+
+
+def parse_position(args: List[str]) -> Board:
+    """
+    Returns board for arguments of the position command, such as
+    "startpos moves e2e4 e7e5" or "fen <fen> moves e2e4"
+    """
+    if args[:1] == ["startpos"]:
+        board = Board.start()
+        rest = args[1:]
+    elif args[:1] == ["fen"]:
+        board = Board.from_fen(" ".join(args[1:7]))
+        rest = args[7:]
+    else:
+        raise ValueError("expected startpos or fen")
+
+    if rest:
+        if rest[0] != "moves":
+            raise ValueError(f"expected moves, got {rest[0]}")
+
+        for uci in rest[1:]:
+            move = board.find_uci_move(uci)
+            if move is None:
+                raise ValueError(f"illegal move {uci}")
+            board.make_move(move)
+
+    return board
+
+
+def parse_go(args: List[str]) -> Dict[str, int]:
+    """
+    Returns limits of the go command by name. Flags such as "infinite" have
+    value 1.
+    """
+    limits: Dict[str, int] = {}
+
+    index = 0
+    while index < len(args):
+        name = args[index]
+
+        if name in GO_LIMITS and index + 1 < len(args):
+            limits[name] = int(args[index + 1])
+            index += 2
+        else:
+            limits[name] = 1
+            index += 1
+
+    return limits
+
+
+def get_time_limit(turn: Color, limits: Dict[str, int]) -> Optional[float]:
+    """
+    Returns seconds to think about the next move, None if there is no limit
+    """
+    if "movetime" in limits:
+        return limits["movetime"] / 1000
+
+    if turn == Color.WHITE:
+        remaining_ms = limits.get("wtime")
+        increment_ms = limits.get("winc", 0)
+    else:
+        remaining_ms = limits.get("btime")
+        increment_ms = limits.get("binc", 0)
+
+    if remaining_ms is None:
+        return None
+
+    moves_to_go = limits.get("movestogo", DEFAULT_MOVES_TO_GO)
+    seconds = remaining_ms / moves_to_go / 1000 + increment_ms / 2000
+
+    # the search can overrun its limit a little, never risk losing on time
+    return min(seconds, remaining_ms / 2000)
+
+
+def format_score(heuristic: int) -> str:
+    """
+    Returns score for info lines, mates in moves of the player to move
+    """
+    if abs(heuristic) >= MIN_CHECKMATE_HEURISTIC:
+        mate_ply = CHECKMATE_HEURISTIC - abs(heuristic)
+        moves = (mate_ply + 1) // 2
+        if heuristic < 0:
+            moves = -moves
+        return f"mate {moves}"
+
+    # bots count a pawn as 1, UCI uses centipawns
+    return f"cp {100 * heuristic}"
+
+
+class UciEngine:
+    def __init__(
+        self,
+        config: BotConfig,
+        output: TextIO,
+        opening_book: Optional[str] = None,
+        bitbases: Optional[str] = None,
+    ) -> None:
+        """
+        Lets bot of config talk UCI with a GUI. Searches run in a thread, so
+        commands are handled while searching.
+        """
+        bot = config.create(
+            Color.WHITE, None, None, opening_book, bitbases, SilentReporter()
+        )
+        assert isinstance(bot, BaseBot)
+
+        self.bot = bot
+        self.default_depth = bot.depth
+        self.output = output
+        self.board = Board.start()
+        self.search_task: Optional["asyncio.Task[None]"] = None
+        self.stop_event = asyncio.Event()
+
+    def send(self, line: str) -> None:
+        self.output.write(line + "\n")
+        self.output.flush()
+
+    async def run(self, input: TextIO) -> None:
+        """
+        Handles commands from input until quit or end of input
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            line = await loop.run_in_executor(None, input.readline)
+            if not line:
+                break
+
+            if not await self.handle(line.split()):
+                break
+
+        await self.stop_search()
+        self.bot.close()
+
+    async def handle(self, tokens: List[str]) -> bool:
+        """
+        Handles one command, returns False if the engine should quit
+        """
+        if not tokens:
+            return True
+
+        command, args = tokens[0], tokens[1:]
+
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME} {self.bot.__class__.__name__}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(
+                "option name Hash type spin"
+                + f" default {self.bot.transposition_table_mb} min 1 max 4096"
+            )
+            self.send("uciok")
+
+        elif command == "isready":
+            self.send("readyok")
+
+        elif command == "ucinewgame":
+            await self.stop_search()
+            self.bot.transposition_table.clear()
+
+        elif command == "setoption":
+            await self.stop_search()
+            self.set_option(args)
+
+        elif command == "position":
+            try:
+                self.board = parse_position(args)
+            except (AssertionError, KeyError, ValueError) as e:
+                self.send(f"info string invalid position: {e}")
+
+        elif command == "go":
+            await self.stop_search()
+
+            try:
+                limits = parse_go(args)
+            except ValueError:
+                self.send(f"info string invalid go command {' '.join(args)}")
+            else:
+                self.start_search(limits)
+
+        elif command == "stop":
+            await self.stop_search()
+
+        elif command == "quit":
+            return False
+
+        elif command not in ["debug", "register", "ponderhit"]:
+            self.send(f"info string unknown command {command}")
+
+        return True
+
+    def set_option(self, args: List[str]) -> None:
+        # arguments look like: name Hash value 32
+        if len(args) == 4 and args[0] == "name" and args[2] == "value":
+            if args[1].lower() == "hash" and args[3].isdigit():
+                size_mb = max(int(args[3]), 1)
+                self.bot.transposition_table_mb = size_mb
+                self.bot.transposition_table = TranspositionTable(size_mb)
+                return
+
+        self.send(f"info string unknown option {' '.join(args)}")
+
+    def start_search(self, limits: Dict[str, int]) -> None:
+        bot = self.bot
+        bot.color = self.board.turn
+        bot.time_limit = get_time_limit(self.board.turn, limits)
+        bot.node_limit = limits.get("nodes")
+        bot.stop_requested = False
+
+        # don't report results of the previous search
+        bot.stats = SearchStats(type(bot).__name__)
+
+        # UCI depth counts the first ply, our depth doesn't
+        if "depth" in limits:
+            bot.depth = max(limits["depth"] - 1, 0)
+        elif (
+            bot.time_limit is not None
+            or bot.node_limit is not None
+            or "infinite" in limits
+        ):
+            bot.depth = MAX_SEARCH_DEPTH
+        else:
+            bot.depth = self.default_depth
+
+        self.stop_event.clear()
+        infinite = "infinite" in limits
+        self.search_task = asyncio.create_task(self.search(self.board, infinite))
+
+    async def stop_search(self) -> None:
+        """
+        Stops running search, if any, and waits until it sent its best move
+        """
+        if self.search_task is None:
+            return
+
+        self.bot.request_stop()
+        self.stop_event.set()
+        await self.search_task
+        self.search_task = None
+
+    def run_search(self, board: Board) -> Optional[Move]:
+        """
+        Searches board in a worker thread
+        """
+        if not board.has_legal_moves():
+            return None
+
+        return self.bot.search(board)
+
+    async def search(self, board: Board, infinite: bool) -> None:
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        future = loop.run_in_executor(None, self.run_search, board.copy())
+
+        reported_depth = 0
+        last_info = start
+
+        while True:
+            done, _ = await asyncio.wait([future], timeout=INFO_POLL_SECONDS)
+            now = time.monotonic()
+
+            finished_depth = self.bot.stats.finished_depth
+
+            if finished_depth != reported_depth:
+                reported_depth = finished_depth
+                self.send_info(now - start, True)
+                last_info = now
+            elif now - last_info >= INFO_INTERVAL_SECONDS:
+                self.send_info(now - start, False)
+                last_info = now
+
+            if done:
+                break
+
+        move = future.result()
+
+        # In infinite mode, the best move is only sent after stop.
+        if infinite:
+            await self.stop_event.wait()
+
+        if move is None:
+            self.send("bestmove 0000")
+        else:
+            self.send(f"bestmove {move.to_uci()}")
+
+    def send_info(self, seconds: float, with_result: bool) -> None:
+        bot = self.bot
+        stats = bot.stats
+        nodes_per_second = int(bot.nodes / max(seconds, 1e-3))
+        info = (
+            f"info nodes {bot.nodes} nps {nodes_per_second}"
+            + f" time {int(seconds * 1000)}"
+        )
+
+        best_move = stats.best_move
+        best_heuristic = stats.best_heuristic
+
+        if with_result and best_move is not None and best_heuristic is not None:
+            score = format_score(best_heuristic)
+            info = (
+                f"info depth {stats.finished_depth} score {score}"
+                + info.removeprefix("info")
+                + f" pv {best_move.to_uci()}"
+            )
+
+        self.send(info)
@@ -0,0 +1,19 @@
+import random
+from typing import List
+
+# Random numbers used to compute Board.key, see Board.compute_key().
+# A fixed seed keeps keys the same between runs and processes.
+_random = random.Random(0x5EED)
+
+# indexed by PieceType and square, the EMPTY PieceType never changes the key
+ZOBRIST_PIECES: List[List[int]] = [64 * [0]] + [
+    [_random.getrandbits(64) for _ in range(64)] for _ in range(12)
+]
+
+ZOBRIST_BLACK_TO_MOVE = _random.getrandbits(64)
+
+# indexed by Castling
+ZOBRIST_CASTLING = [_random.getrandbits(64) for _ in range(4)]
+
+# indexed by en passent column
+ZOBRIST_EN_PASSENT = [_random.getrandbits(64) for _ in range(8)]
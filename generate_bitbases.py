@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import time
+
+from chessbot.bitbase import (
+    BITBASE_SIGNATURES,
+    Bitbases,
+    generate_bitbase,
+    get_bitbase_path,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate endgame bitbases with retrograde analysis."
+    )
+    parser.add_argument(
+        "signatures",
+        nargs="*",
+        default=BITBASE_SIGNATURES,
+        help=f"material signatures, default is all of: {', '.join(BITBASE_SIGNATURES)}",
+    )
+    parser.add_argument("--directory", default="bitbases", help="output directory")
+    args = parser.parse_args()
+
+    for signature in args.signatures:
+        if signature not in BITBASE_SIGNATURES:
+            parser.error(f"unknown signature {signature}")
+
+    os.makedirs(args.directory, exist_ok=True)
+
+    # generate in order, so signatures can use the ones they promote into
+    for signature in BITBASE_SIGNATURES:
+        if signature not in args.signatures:
+            continue
+
+        bitbases = Bitbases.open(args.directory)
+        start = time.perf_counter()
+
+        try:
+            data = generate_bitbase(signature, bitbases)
+        finally:
+            bitbases.close()
+
+        path = get_bitbase_path(args.directory, signature)
+        with open(path, "wb") as file:
+            file.write(data)
+
+        seconds = time.perf_counter() - start
+        print(f"{signature}: wrote {path} in {seconds:.1f} sec")
+
+
+if __name__ == "__main__":
+    main()
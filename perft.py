@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+import argparse
+import sys
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from chessbot.board import Board
+from chessbot.perft import PERFT_SUITE, divide, perft
+
+
+def parse_positions(position: str) -> List[Tuple[str, str, Optional[List[int]]]]:
+    """
+    Returns name, FEN and known perft results for requested positions
+    """
+    if position == "all":
+        return [(name, fen, counts) for name, (fen, counts) in PERFT_SUITE.items()]
+
+    if position in PERFT_SUITE:
+        fen, counts = PERFT_SUITE[position]
+        return [(position, fen, counts)]
+
+    return [("fen", position, None)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Count move tree sizes to check and benchmark move generation."
+    )
+    parser.add_argument(
+        "position",
+        nargs="?",
+        default="start",
+        help=f"FEN, 'all' or one of: {', '.join(PERFT_SUITE)}",
+    )
+    parser.add_argument("-d", "--depth", type=int, default=3)
+    parser.add_argument(
+        "--divide", action="store_true", help="show perft result per root move"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit with non-zero status if a result differs from known results",
+    )
+    args = parser.parse_args()
+
+    mismatches = 0
+    total_nodes = 0
+    total_seconds = 0.0
+
+    for name, fen, counts in parse_positions(args.position):
+        board = Board.from_fen(fen)
+        print(f"{name}: {fen}")
+
+        if args.divide:
+            for move, nodes in divide(board, args.depth):
+                print(f"{move.to_uci()}: {nodes}")
+            print()
+
+        for depth in range(1, args.depth + 1):
+            start = datetime.now()
+            nodes = perft(board, depth)
+            seconds = (datetime.now() - start).total_seconds()
+
+            total_nodes += nodes
+            total_seconds += seconds
+
+            if counts is None or depth > len(counts):
+                result = ""
+            elif nodes == counts[depth - 1]:
+                result = " | OK"
+            else:
+                result = f" | expected {counts[depth - 1]}"
+                mismatches += 1
+
+            speed = nodes / max(seconds, 1e-9)
+            print(
+                f"depth {depth:>2} | {nodes:>10} nodes | {seconds:8.3f} sec"
+                + f" | {speed:8.0f} nodes/sec{result}"
+            )
+
+        print()
+
+    print(
+        f"total: {total_nodes} nodes | {total_seconds:.3f} sec"
+        + f" | {total_nodes / max(total_seconds, 1e-9):.0f} nodes/sec"
+    )
+
+    if args.check and mismatches:
+        print(f"{mismatches} result(s) differ from known results.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
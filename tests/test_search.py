@@ -0,0 +1,112 @@
+from typing import List, Type
+
+import pytest
+
+from chessbot.board import Board
+from chessbot.move import Move
+from chessbot.perft import PERFT_SUITE
+from chessbot.players.base import INFINITE_HEURISTIC, BaseBot, get_history_keys
+from chessbot.players.bot_material import MaterialBot
+from chessbot.players.bot_pawn_pusher import PawnPusherBot
+
+BOT_CLASSES: List[Type[BaseBot]] = [MaterialBot, PawnPusherBot]
+
+# perft positions and a position with an en passent capture
+FENS = [fen for fen, _ in PERFT_SUITE.values()] + [
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"
+]
+
+
+def prepare_search(bot: BaseBot, board: Board) -> Board:
+    """
+    Returns copy of board to search on, sets up bot like search() does
+    """
+    bot.game_position_keys = get_history_keys(board)
+    board = board.copy()
+    board.set_piece_square_table(bot.piece_square_table)
+    bot.root_history_length = len(board.history)
+    return board
+
+
+def get_child_keys(board: Board) -> List[int]:
+    keys: List[int] = []
+    for move in board.get_legal_moves():
+        board.make_move(move)
+        keys.append(board.key)
+        board.unmake_move()
+    return keys
+
+
+def get_leaf_heuristics(bot: BaseBot, board: Board, moves: List[Move]) -> List[int]:
+    heuristics: List[int] = []
+    for move in moves:
+        board.make_move(move)
+        heuristics.append(
+            -bot.negamax(board, 0, -INFINITE_HEURISTIC, INFINITE_HEURISTIC)
+        )
+        board.unmake_move()
+    return heuristics
+
+
+def search_score(
+    bot_class: Type[BaseBot], board: Board, depth: int, batch_leaves: bool
+) -> int:
+    bot = bot_class(board.turn, depth)
+    bot.batch_leaves = batch_leaves
+    board = prepare_search(bot, board)
+    return bot.negamax(board, depth, -INFINITE_HEURISTIC, INFINITE_HEURISTIC)
+
+
+@pytest.mark.parametrize("bot_class", BOT_CLASSES)
+@pytest.mark.parametrize("fen", FENS)
+def test_evaluate_children(bot_class: Type[BaseBot], fen: str) -> None:
+    board = Board.from_fen(fen)
+    bot = bot_class(board.turn, 1)
+    board = prepare_search(bot, board)
+
+    # also check children, which are not the side of the bot to move
+    for move in [None] + board.get_legal_moves():
+        if move is not None:
+            board.make_move(move)
+
+        moves = board.get_legal_moves()
+        expected = get_leaf_heuristics(bot, board, moves)
+        assert bot.evaluate_children(board, moves) == expected
+
+        if move is not None:
+            board.unmake_move()
+
+
+@pytest.mark.parametrize("bot_class", BOT_CLASSES)
+@pytest.mark.parametrize("fen", FENS)
+def test_batched_leaves_repeating_game_positions(
+    bot_class: Type[BaseBot], fen: str
+) -> None:
+    heuristics: List[int] = []
+
+    for batch_leaves in [True, False]:
+        bot = bot_class(Board.from_fen(fen).turn, 1)
+        bot.batch_leaves = batch_leaves
+        board = prepare_search(bot, Board.from_fen(fen))
+
+        # every child repeats a position of the game
+        bot.game_position_keys = set(get_child_keys(board))
+        heuristics.append(
+            bot.negamax(board, 1, -INFINITE_HEURISTIC, INFINITE_HEURISTIC)
+        )
+
+    assert heuristics[0] == heuristics[1]
+
+
+@pytest.mark.parametrize("bot_class", BOT_CLASSES)
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_batched_leaves_game_history(bot_class: Type[BaseBot], depth: int) -> None:
+    board = Board.from_fen(PERFT_SUITE["start"][0])
+    for uci in ["g1f3", "g8f6", "f3g1", "f6g8", "b1c3", "b8c6"]:
+        move = board.find_uci_move(uci)
+        assert move is not None
+        board.make_move(move)
+
+    assert search_score(bot_class, board, depth, True) == search_score(
+        bot_class, board, depth, False
+    )
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import time
+from typing import List
+
+from chessbot.pgn import START_FEN
+from chessbot.tournament import (
+    BOT_CLASSES,
+    BOT_OPTIONS,
+    BotConfig,
+    Standings,
+    get_tasks,
+    play_games,
+)
+
+
+def read_openings(path: str) -> List[str]:
+    """
+    Returns FENs from file, one per line. Empty lines and lines starting with #
+    are skipped.
+    """
+    openings: List[str] = []
+
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                openings.append(line)
+
+    return openings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Play a tournament between bots using multiple processes."
+    )
+    parser.add_argument(
+        "bots",
+        nargs="+",
+        type=BotConfig,
+        help="bot configs such as material:3 or material:2:quiescence, bots are "
+        + f"{', '.join(BOT_CLASSES)} or random, options are {', '.join(BOT_OPTIONS)}",
+    )
+    parser.add_argument(
+        "--gauntlet",
+        action="store_true",
+        help="let the first bot play all others, instead of a round robin",
+    )
+    parser.add_argument(
+        "--openings",
+        help="file with one FEN per line, every opening is played with both colors",
+    )
+    parser.add_argument("--time-limit", type=float, help="seconds per move")
+    parser.add_argument("--node-limit", type=int, help="nodes per move")
+    parser.add_argument("--book", help="Polyglot opening book used by all bots")
+    parser.add_argument("--bitbases", help="directory with bitbases used by all bots")
+    parser.add_argument(
+        "--max-plies",
+        type=int,
+        default=300,
+        help="games that take longer are a draw",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pgn", default="tournament.pgn", help="output file")
+    args = parser.parse_args()
+
+    if len(args.bots) < 2:
+        parser.error("a tournament needs at least two bots")
+
+    if len({config.spec for config in args.bots}) != len(args.bots):
+        parser.error("bots need to be unique")
+
+    if args.openings:
+        openings = read_openings(args.openings)
+    else:
+        openings = [START_FEN]
+
+    tasks = get_tasks(
+        args.bots,
+        openings,
+        args.gauntlet,
+        args.max_plies,
+        args.time_limit,
+        args.node_limit,
+        args.book,
+        args.bitbases,
+    )
+
+    standings = Standings(args.bots)
+    start = time.perf_counter()
+
+    with open(args.pgn, "w") as pgn_file:
+        for result in play_games(tasks, args.workers):
+            pgn_file.write(result.to_pgn("chessbot tournament") + "\n")
+            pgn_file.flush()
+            standings.add(result)
+
+            print(
+                f"game {result.task.round_number:>4}/{len(tasks)}"
+                + f" | {result.task.white.spec} vs {result.task.black.spec}"
+                + f" | {result.get_pgn_result():<7}"
+                + f" | {result.game_state.name.lower()}"
+            )
+
+    print()
+    print(standings.format(time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+import argparse
+import asyncio
+import sys
+
+from chessbot.tournament import BOT_CLASSES, BOT_OPTIONS, BotConfig
+from chessbot.uci import UciEngine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run a bot as UCI engine, for use in chess GUIs and match tools."
+    )
+    parser.add_argument(
+        "bot",
+        nargs="?",
+        type=BotConfig,
+        default=BotConfig("material:3"),
+        help="bot config such as material:3 or material:2:quiescence, the depth is"
+        + " used when go has no limits, bots are "
+        + f"{', '.join(BOT_CLASSES)}, options are {', '.join(BOT_OPTIONS)}",
+    )
+    parser.add_argument("--book", help="Polyglot opening book")
+    parser.add_argument("--bitbases", help="directory with bitbases")
+    args = parser.parse_args()
+
+    if args.bot.bot_class is None:
+        parser.error("random bot can't be used as engine")
+
+    engine = UciEngine(args.bot, sys.stdout, args.book, args.bitbases)
+    asyncio.run(engine.run(sys.stdin))
+
+
+if __name__ == "__main__":
+    main()